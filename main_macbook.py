@@ -7,15 +7,60 @@ Usage:
     python main_macbook.py [--config config.yaml] [--setup] [--test] [--install-deps]
 """
 
-import yaml
 import subprocess
 import sys
 import os
 import argparse
+import atexit
+import copy
+import fnmatch
+import io
+import shlex
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# Paths never worth shipping to the instance
+RSYNC_EXCLUDES = ['.git', '__pycache__', '*.pyc', 'results/']
+
+# Parsed configs keyed by path, validated against (mtime, size) on each load
+_CONFIG_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
+# Seconds allowed for one remote command, and (unless connection.batch_timeout
+# is set) for a batched setup/install script, which runs apt and pip
+SSH_COMMAND_TIMEOUT = 60
+BATCH_TIMEOUT = 1800
+
+
+class _ThreadBufferedStdout:
+    """Stand-in for sys.stdout that holds back output of threads in run()
+    
+    Output written by a thread inside run() is collected separately and
+    returned when its operation finishes; other threads write through.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def run(self, operation):
+        """Call operation(), returning (its result, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return operation(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
 
 class EC2Connector:
     """Manages connection and operations with EC2 instance"""
@@ -31,28 +76,83 @@ class EC2Connector:
         self.remote_path = self.config['project']['remote_path']
         self.ssh_port = self.config['ssh'].get('port', 22)
         self.use_password_auth = self.config['ssh'].get('use_password_auth', False)
+        self.batch_timeout = self.config['connection'].get('batch_timeout', BATCH_TIMEOUT)
+        
+        # Multiplex all ssh/rsync invocations over one master connection so
+        # only the first command pays the key-exchange/auth handshake
+        self.control_path = os.path.expanduser(
+            f"~/.ssh/cm-{self.host}-{self.ssh_port}-{os.getpid()}.sock"
+        )
+        self.control_opts = [
+            '-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={self.control_path}',
+            '-o', 'ControlPersist=600'
+        ]
+        atexit.register(self.close)
+        
+        # Build the ssh argv prefix and rsync transport string once
+        ssh_opts = ['-p', str(self.ssh_port), '-o', 'StrictHostKeyChecking=no', *self.control_opts]
+        if self.ssh_key:
+            ssh_opts.extend(['-i', self.ssh_key])
+        self._ssh_base = ['ssh', *ssh_opts, '-o', 'ConnectTimeout=30', f'{self.user}@{self.host}']
+        self._rsync_ssh_e = ' '.join(['ssh', *ssh_opts])
         
     def _load_config(self) -> Dict:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file
+        
+        Parsed configs are cached per path and reused while the file's
+        mtime and size are unchanged. Callers get a deep copy so they can
+        mutate it freely.
+        """
+        try:
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            print(f"❌ Configuration file {self.config_path} not found!")
+            sys.exit(1)
+        
+        cache_key = os.path.abspath(self.config_path)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[:2] == (st.st_mtime, st.st_size):
+            _CONFIG_CACHE.move_to_end(cache_key)
+            return copy.deepcopy(cached[2])
+        
+        # Imported here so cache hits (and startup) never pay for PyYAML.
+        # Prefer the libyaml-backed loader; fall back to pure Python if
+        # PyYAML was built without it.
+        import yaml
+        try:
+            from yaml import CSafeLoader as Loader
+        except ImportError:
+            from yaml import SafeLoader as Loader
+        
         try:
             with open(self.config_path, 'r') as file:
-                return yaml.safe_load(file)
+                config = yaml.load(file, Loader=Loader)
         except FileNotFoundError:
             print(f"❌ Configuration file {self.config_path} not found!")
             sys.exit(1)
         except yaml.YAMLError as e:
             print(f"❌ Error parsing configuration file: {e}")
             sys.exit(1)
-    
-    def _run_ssh_command(self, command: str, capture_output: bool = True) -> subprocess.CompletedProcess:
-        """Execute SSH command on EC2 instance"""
-        ssh_cmd = ['ssh', '-p', str(self.ssh_port), '-o', 'StrictHostKeyChecking=no', '-o', 'ConnectTimeout=30']
         
-        # Add SSH key if provided
-        if self.ssh_key:
-            ssh_cmd.extend(['-i', self.ssh_key])
+        _CONFIG_CACHE[cache_key] = (st.st_mtime, st.st_size, config)
+        _CONFIG_CACHE.move_to_end(cache_key)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
         
-        ssh_cmd.extend([f'{self.user}@{self.host}', command])
+        return copy.deepcopy(config)
+    
+    def _run_ssh_command(self, command: str, capture_output: bool = True, tty: bool = False,
+                         timeout: float = SSH_COMMAND_TIMEOUT,
+                         input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Execute SSH command on EC2 instance
+        
+        With tty=True a terminal is allocated on the remote side (ssh -t),
+        for commands that prompt. input, if given, is sent to the remote
+        command's stdin.
+        """
+        ssh, *ssh_args = self._ssh_base
+        ssh_cmd = [ssh, *(['-t'] if tty else []), *ssh_args, command]
         
         print(f"🔗 Executing: {' '.join(ssh_cmd[:3])} ... {command}")
         
@@ -60,8 +160,9 @@ class EC2Connector:
             result = subprocess.run(
                 ssh_cmd,
                 capture_output=capture_output,
+                input=input,
                 text=True,
-                timeout=60
+                timeout=timeout
             )
             return result
         except subprocess.TimeoutExpired:
@@ -71,6 +172,20 @@ class EC2Connector:
             print(f"❌ SSH command failed: {e}")
             return subprocess.CompletedProcess(ssh_cmd, 1, "", str(e))
     
+    def close(self):
+        """Shut down the multiplexed master connection, if one is running"""
+        if not os.path.exists(self.control_path):
+            return
+        
+        try:
+            subprocess.run(
+                ['ssh', '-O', 'exit', '-o', f'ControlPath={self.control_path}', f'{self.user}@{self.host}'],
+                capture_output=True,
+                timeout=10
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+    
     def test_connection(self) -> bool:
         """Test connection to EC2 instance"""
         print("🧪 Testing connection to EC2 instance...")
@@ -99,64 +214,238 @@ class EC2Connector:
             print(f"   Error: {result.stderr.strip()}")
             return False
     
-    def setup_environment(self) -> bool:
-        """Set up basic environment on EC2 instance"""
+    def _batch_commands(self, commands: List[str]) -> str:
+        """Join commands into one remote script, marking where each one starts"""
+        parts = ["set -eo pipefail"]
+        for i, cmd in enumerate(commands):
+            parts.append(f"echo '---CMD-{i}---'")
+            parts.append(f"({cmd})")
+        return "; ".join(parts)
+    
+    def _failed_command_index(self, output: str) -> int:
+        """Index of the last command that started in a batched run's output"""
+        index = 0
+        for line in output.splitlines():
+            line = line.strip()
+            if line.startswith('---CMD-') and line.endswith('---'):
+                index = int(line[len('---CMD-'):-len('---')])
+        return index
+    
+    def _run_batched(self, commands: List[str]) -> Optional[str]:
+        """Run commands in a single SSH invocation, allowed batch_timeout seconds
+        
+        Returns:
+            None on success, otherwise the command that failed
+        """
+        result = self._run_ssh_command(self._batch_commands(commands), timeout=self.batch_timeout)
+        
+        if result.returncode == 0:
+            return None
+        
+        failed = commands[self._failed_command_index(result.stdout or "")]
+        print(f"   Error: {result.stderr.strip()}")
+        return failed
+    
+    def setup_environment(self, interactive: bool = False) -> bool:
+        """Set up basic environment on EC2 instance
+        
+        Commands are batched into one SSH call. With interactive=True they run
+        one at a time attached to the terminal, for commands that need a TTY.
+        """
         print("🔧 Setting up environment on EC2 instance...")
         
         setup_commands = self.config['connection']['setup_commands']
         
-        for cmd in setup_commands:
-            print(f"   Running: {cmd}")
-            result = self._run_ssh_command(cmd)
+        if interactive:
+            for cmd in setup_commands:
+                print(f"   Running: {cmd}")
+                result = self._run_ssh_command(cmd, capture_output=False, tty=True,
+                                               timeout=self.batch_timeout)
+                
+                if result.returncode != 0:
+                    print(f"❌ Setup command failed: {cmd}")
+                    return False
+        else:
+            for cmd in setup_commands:
+                print(f"   Running: {cmd}")
             
-            if result.returncode != 0:
-                print(f"❌ Setup command failed: {cmd}")
-                print(f"   Error: {result.stderr.strip()}")
+            failed = self._run_batched(setup_commands)
+            if failed is not None:
+                print(f"❌ Setup command failed: {failed}")
                 return False
         
         print("✅ Environment setup completed!")
         return True
     
-    def install_python_dependencies(self) -> bool:
-        """Install Python dependencies on EC2 instance"""
-        print("📦 Installing Python dependencies...")
+    def install_dependencies(self) -> bool:
+        """Install system and Python dependencies in a single SSH invocation"""
+        print("📦 Installing system and Python dependencies...")
         
-        deps = self.config['python_dependencies']
-        deps_str = ' '.join(deps)
+        system_deps = ' '.join(self.config['system_dependencies'])
+        python_deps = ' '.join(self.config['python_dependencies'])
         
-        # Install Python packages
-        install_cmd = f"pip3 install {deps_str} --user"
-        result = self._run_ssh_command(install_cmd)
+        failed = self._run_batched([
+            f"sudo apt update && sudo apt install -y {system_deps}",
+            f"pip3 install {python_deps} --user"
+        ])
         
-        if result.returncode == 0:
-            print("✅ Python dependencies installed successfully!")
+        if failed is None:
+            print("✅ Dependencies installed successfully!")
             return True
         else:
-            print("❌ Failed to install Python dependencies!")
-            print(f"   Error: {result.stderr.strip()}")
+            print(f"❌ Failed to install dependencies: {failed}")
             return False
     
-    def install_system_dependencies(self) -> bool:
-        """Install system dependencies on EC2 instance"""
-        print("🔧 Installing system dependencies...")
+    def _rsync_transfer_flags(self) -> List[str]:
+        """Archive/compression flags suited to the local rsync version
         
-        deps = self.config['system_dependencies']
-        deps_str = ' '.join(deps)
+        zstd compression and --info=progress2 need rsync >= 3.2; older builds
+        (e.g. the macOS system rsync) fall back to zlib via -z.
+        """
+        try:
+            result = subprocess.run(['rsync', '--version'], capture_output=True, text=True, timeout=10)
+            version = result.stdout.split('version', 1)[1].split()[0]
+            major, minor = (int(part) for part in version.split('.')[:2])
+        except (OSError, subprocess.TimeoutExpired, IndexError, ValueError):
+            major, minor = 0, 0
         
-        # Install system packages
-        install_cmd = f"sudo apt update && sudo apt install -y {deps_str}"
-        result = self._run_ssh_command(install_cmd)
+        if (major, minor) >= (3, 2):
+            return ['-aH', '--sparse', '--compress', '--compress-choice=zstd',
+                    '--compress-level=3', '--info=progress2']
+        return ['-avzH', '--sparse']
+    
+    def _is_excluded(self, name: str, is_dir: bool) -> bool:
+        """Whether a path component matches one of RSYNC_EXCLUDES"""
+        for pattern in RSYNC_EXCLUDES:
+            if pattern.endswith('/'):
+                if is_dir and fnmatch.fnmatch(name, pattern[:-1]):
+                    return True
+            elif fnmatch.fnmatch(name, pattern):
+                return True
+        return False
+    
+    def _is_excluded_path(self, rel_path: str) -> bool:
+        """Whether any component of a relative file path is excluded"""
+        *dirs, name = rel_path.split('/')
+        return (any(self._is_excluded(d, is_dir=True) for d in dirs) or
+                self._is_excluded(name, is_dir=False))
+    
+    def _local_manifest(self, local_path: str) -> Dict[str, tuple]:
+        """Map relative path -> (size, mtime seconds) for files and symlinks to sync
         
-        if result.returncode == 0:
-            print("✅ System dependencies installed successfully!")
-            return True
-        else:
-            print("❌ Failed to install system dependencies!")
-            print(f"   Error: {result.stderr.strip()}")
+        Symlinks are described by the link itself (lstat), as rsync -a copies
+        them and as the remote manifest lists them.
+        """
+        manifest = {}
+        for root, dirs, files in os.walk(local_path):
+            dirs[:] = [d for d in dirs if not self._is_excluded(d, is_dir=True)]
+            # os.walk lists symlinks to directories under dirs without
+            # descending into them; they are synced as links
+            links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+            dirs[:] = [d for d in dirs if d not in links]
+            for name in files + links:
+                if self._is_excluded(name, is_dir=False):
+                    continue
+                full = os.path.join(root, name)
+                st = os.lstat(full)
+                manifest[os.path.relpath(full, local_path)] = (st.st_size, int(st.st_mtime))
+        return manifest
+    
+    def _remote_manifest(self) -> Optional[Dict[str, tuple]]:
+        """Map relative path -> (size, mtime seconds) for files and symlinks on the instance"""
+        result = self._run_ssh_command(
+            f"cd {shlex.quote(self.remote_path)} && find . \\( -type f -o -type l \\) -printf '%s %T@ %P\\n'"
+        )
+        if result.returncode != 0:
+            return None
+        
+        manifest = {}
+        for line in result.stdout.splitlines():
+            size, mtime, path = line.split(' ', 2)
+            manifest[path] = (int(size), int(float(mtime)))
+        return manifest
+    
+    def _remove_remote_files(self, paths: List[str]) -> subprocess.CompletedProcess:
+        """Delete files under remote_path, then directories left empty
+        
+        Paths go over stdin, NUL-separated, so no list is too long for the
+        remote command line. Directories matching RSYNC_EXCLUDES (and
+        anything under them) are kept, as rsync --delete would.
+        """
+        keep = ' '.join(
+            f"! -name {shlex.quote(name)} ! -path {shlex.quote(f'*/{name}/*')}"
+            for name in (pattern.rstrip('/') for pattern in RSYNC_EXCLUDES)
+        )
+        command = (
+            f"cd {shlex.quote(self.remote_path)} && xargs -0 rm -f -- && "
+            f"find . -mindepth 1 -type d -empty {keep} -delete"
+        )
+        return self._run_ssh_command(command, input='\0'.join(paths))
+    
+    def _parallel_sync(self, local_path: str, workers: int) -> bool:
+        """Sync by diffing manifests and splitting changed files across rsync workers
+        
+        Every worker shares the ControlMaster connection, so the extra
+        transfers cost no additional handshakes.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        local = self._local_manifest(local_path)
+        remote = self._remote_manifest()
+        if remote is None:
+            print("❌ Failed to list remote files!")
+            return False
+        
+        changed = sorted((p for p, meta in local.items() if remote.get(p) != meta),
+                         key=lambda p: local[p][0], reverse=True)
+        stale = [p for p in remote if p not in local and not self._is_excluded_path(p)]
+        
+        print(f"   {len(changed)} changed, {len(stale)} removed, {workers} workers")
+        
+        # Deal largest-first round-robin so workers get similar byte counts
+        batches = [changed[i::workers] for i in range(workers)]
+        batches = [b for b in batches if b]
+        flags = self._rsync_transfer_flags()
+        
+        def transfer(batch: List[str]) -> subprocess.CompletedProcess:
+            rsync_cmd = [
+                'rsync', *flags, '--files-from=-',
+                '-e', self._rsync_ssh_e,
+                f'{local_path}/',
+                f'{self.user}@{self.host}:{self.remote_path}/'
+            ]
+            return subprocess.run(rsync_cmd, input='\n'.join(batch), capture_output=True,
+                                  text=True, timeout=300)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=len(batches) or 1) as executor:
+                results = list(executor.map(transfer, batches))
+        except subprocess.TimeoutExpired:
+            print("❌ File sync timed out!")
+            return False
+        
+        failures = [r for r in results if r.returncode != 0]
+        if stale:
+            rm_result = self._remove_remote_files(stale)
+            if rm_result.returncode != 0:
+                failures.append(rm_result)
+        
+        if failures:
+            print("❌ Failed to sync project files!")
+            for failure in failures:
+                print(f"   Error: {failure.stderr.strip()}")
             return False
+        
+        print("✅ Project files synced successfully!")
+        return True
     
-    def sync_project_files(self) -> bool:
-        """Sync project files to EC2 instance"""
+    def sync_project_files(self, workers: int = 1) -> bool:
+        """Sync project files to EC2 instance
+        
+        With workers > 1, changed files are found by comparing size/mtime
+        manifests and transferred by that many rsync processes in parallel,
+        which helps when syncing many small files over a high-latency link.
+        """
         print("📁 Syncing project files to EC2 instance...")
         
         local_path = self.config['project']['local_path']
@@ -169,12 +458,17 @@ class EC2Connector:
             print(f"❌ Failed to create remote directory: {result.stderr.strip()}")
             return False
         
+        if workers > 1:
+            print(f"   Syncing: {local_path} -> {self.host}:{self.remote_path}")
+            return self._parallel_sync(local_path, workers)
+        
         # Sync files using rsync
         rsync_cmd = [
             'rsync',
-            '-avz',
+            *self._rsync_transfer_flags(),
             '--delete',
-            '-e', f'ssh -p {self.ssh_port} -o StrictHostKeyChecking=no' + (f' -i {self.ssh_key}' if self.ssh_key else ''),
+            *(f'--exclude={pattern}' for pattern in RSYNC_EXCLUDES),
+            '-e', self._rsync_ssh_e,
             f'{local_path}/',
             f'{self.user}@{self.host}:{self.remote_path}/'
         ]
@@ -213,16 +507,10 @@ class EC2Connector:
         print("🐚 Opening remote shell...")
         print("   Type 'exit' to return to local shell")
         
-        ssh_cmd = ['ssh', '-p', str(self.ssh_port), '-o', 'StrictHostKeyChecking=no']
-        
-        # Add SSH key if provided
-        if self.ssh_key:
-            ssh_cmd.extend(['-i', self.ssh_key])
-        
-        ssh_cmd.append(f'{self.user}@{self.host}')
-        
+        # Same options as every other command, so the shell reuses the
+        # multiplexed connection
         try:
-            subprocess.run(ssh_cmd)
+            subprocess.run(self._ssh_base)
         except KeyboardInterrupt:
             print("\n👋 Remote shell closed")
 
@@ -233,8 +521,10 @@ def main():
     parser.add_argument('--config', default='config.yaml', help='Configuration file path')
     parser.add_argument('--test', action='store_true', help='Test connection only')
     parser.add_argument('--setup', action='store_true', help='Setup environment')
+    parser.add_argument('--interactive', action='store_true', help='Run setup commands one at a time with a TTY')
     parser.add_argument('--install-deps', action='store_true', help='Install dependencies')
     parser.add_argument('--sync', action='store_true', help='Sync project files')
+    parser.add_argument('--sync-workers', type=int, help='Parallel rsync workers for --sync (default: project.sync_workers or 1)')
     parser.add_argument('--shell', action='store_true', help='Open remote shell')
     parser.add_argument('--command', help='Execute remote command')
     
@@ -257,18 +547,38 @@ def main():
         return
     
     if args.setup:
-        if not connector.setup_environment():
+        if not connector.setup_environment(interactive=args.interactive):
             sys.exit(1)
     
+    # Dependency install and file sync are independent; overlap their
+    # network round-trips when both are requested
+    operations = []
     if args.install_deps:
-        if not connector.install_system_dependencies():
-            sys.exit(1)
-        if not connector.install_python_dependencies():
-            sys.exit(1)
-    
+        operations.append(connector.install_dependencies)
     if args.sync:
-        if not connector.sync_project_files():
-            sys.exit(1)
+        workers = args.sync_workers or connector.config['project'].get('sync_workers', 1)
+        operations.append(lambda: connector.sync_project_files(workers=workers))
+    
+    if len(operations) > 1:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        # Each operation's messages are printed as one block when it
+        # finishes, so the two never interleave line by line
+        stdout = sys.stdout = _ThreadBufferedStdout(sys.stdout)
+        try:
+            with ThreadPoolExecutor(max_workers=len(operations)) as executor:
+                futures = [executor.submit(stdout.run, op) for op in operations]
+                results = []
+                for future in as_completed(futures):
+                    result, output = future.result()
+                    print(output, end='')
+                    results.append(result)
+        finally:
+            sys.stdout = stdout._stream
+    else:
+        results = [op() for op in operations]
+    
+    if not all(results):
+        sys.exit(1)
     
     if args.command:
         connector.execute_remote_command(args.command)
@@ -281,8 +591,10 @@ def main():
         print("\n📋 Available operations:")
         print("   --test          Test connection to EC2")
         print("   --setup         Setup basic environment")
+        print("   --interactive   Run setup commands one at a time (TTY)")
         print("   --install-deps  Install all dependencies")
         print("   --sync          Sync project files")
+        print("   --sync-workers N  Parallel rsync workers for --sync")
         print("   --shell         Open remote shell")
         print("   --command CMD   Execute remote command")
         print("\n💡 Example: python main_macbook.py --install-deps --sync")
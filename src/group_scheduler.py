@@ -7,16 +7,83 @@ This module provides functionality to:
 - Provide summary statistics
 """
 
-import pandas as pd
-from typing import Dict, Any
+import csv
+import os
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Tuple, Union, TYPE_CHECKING
 from pathlib import Path
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ValidationError(Exception):
     """Custom exception for data validation errors."""
     pass
 
 
+@dataclass
+class GroupData:
+    """Group scheduling data stored as one NumPy array per column.
+    
+    Supports the small subset of the DataFrame interface used by the
+    scheduler and timeline (``len(data)``, ``data['column']``), so either
+    representation can be passed to them.
+    """
+    group_id: np.ndarray
+    group_size: np.ndarray
+    start_percent: np.ndarray
+    stop_percent: np.ndarray
+    
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame') -> 'GroupData':
+        """Build from a DataFrame with the required columns."""
+        return cls(**{f.name: df[f.name].to_numpy() for f in fields(cls)})
+    
+    def to_dataframe(self) -> 'pd.DataFrame':
+        """Convert to a DataFrame (for display and CSV output)."""
+        import pandas as pd
+        return pd.DataFrame({f.name: getattr(self, f.name) for f in fields(self)})
+    
+    @property
+    def columns(self):
+        """Column names, in CSV order."""
+        return [f.name for f in fields(self)]
+    
+    def __len__(self) -> int:
+        return len(self.group_id)
+    
+    def __getitem__(self, column: str) -> np.ndarray:
+        if column not in self.columns:
+            raise KeyError(column)
+        return getattr(self, column)
+
+
+GroupFrame = Union['pd.DataFrame', GroupData]
+
+
+def _parse_column(values: List[str]) -> np.ndarray:
+    """Parse CSV strings as integers if they all are, otherwise as floats.
+    
+    Blank cells load as NaN, so validate_data reports them.
+    """
+    # One vectorized string conversion per column instead of a Python-level
+    # int()/float() call per value
+    strings = np.array(values, dtype=str)
+    try:
+        return strings.astype(np.int64)
+    except ValueError:
+        return np.where(strings == '', 'nan', strings).astype(np.float64)
+
+
+# Parsed CSV columns keyed on (path, mtime, size) so unchanged files are
+# not re-read (LRU bounded)
+LOAD_CACHE_SIZE = 32
+_loaded: "OrderedDict[Tuple[str, int, int], Dict[str, np.ndarray]]" = OrderedDict()
+
+
 class GroupScheduler:
     """Handle loading and validation of group scheduling data.
     
@@ -36,40 +103,72 @@ class GroupScheduler:
         """Initialize the scheduler."""
         pass
     
-    def load_csv(self, filepath: str) -> pd.DataFrame:
+    def load_csv(self, filepath: str) -> GroupData:
         """Load group data from CSV file.
         
         Args:
             filepath: Path to CSV file
             
         Returns:
-            DataFrame with columns: group_id, group_size, start_percent, stop_percent
+            GroupData with columns: group_id, group_size, start_percent, stop_percent
             
         Raises:
             FileNotFoundError: If CSV file doesn't exist
             ValueError: If CSV format is invalid
+            
+        Files that have not changed since they were last loaded are served
+        from a cache; the returned arrays are read-only.
         """
         if not Path(filepath).exists():
             raise FileNotFoundError(f"CSV file not found: {filepath}")
         
+        stat = os.stat(filepath)
+        key = (os.path.realpath(filepath), stat.st_mtime_ns, stat.st_size)
+        columns = _loaded.get(key)
+        if columns is None:
+            columns = self._parse_csv(filepath)
+            for values in columns.values():
+                values.setflags(write=False)
+            _loaded[key] = columns
+            if len(_loaded) > LOAD_CACHE_SIZE:
+                _loaded.popitem(last=False)
+        else:
+            _loaded.move_to_end(key)
+        
+        return GroupData(**columns)
+    
+    def _parse_csv(self, filepath: str) -> Dict[str, np.ndarray]:
+        """Parse the required columns of a group CSV file.
+        
+        Raises:
+            ValueError: If CSV format is invalid
+        """
+        # Files hold at most a handful of rows, so the stdlib reader avoids
+        # pandas' import and parser setup cost entirely
         try:
-            data = pd.read_csv(filepath)
+            with open(filepath, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+                columns = reader.fieldnames or []
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {e}")
         
         # Check required columns
-        required_cols = ['group_id', 'group_size', 'start_percent', 'stop_percent']
-        missing_cols = set(required_cols) - set(data.columns)
+        required_cols = [f.name for f in fields(GroupData)]
+        missing_cols = set(required_cols) - set(columns)
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
-        return data
+        try:
+            return {col: _parse_column([row[col] for row in rows]) for col in required_cols}
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Error reading CSV file: {e}")
     
-    def validate_data(self, data: pd.DataFrame) -> bool:
+    def validate_data(self, data: GroupFrame) -> bool:
         """Validate group scheduling data against constraints.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             
         Returns:
             True if all validations pass
@@ -78,54 +177,64 @@ class GroupScheduler:
             ValidationError: If any constraint is violated
         """
         # Check number of groups
+        if len(data) == 0:
+            raise ValidationError("At least one group is required")
         if len(data) > self.MAX_GROUPS:
             raise ValidationError(f"Maximum {self.MAX_GROUPS} groups allowed, got {len(data)}")
         
-        # Check start times >= 0
-        if any(data['start_percent'] < self.MIN_TIME):
-            raise ValidationError(f"Start times must be >= {self.MIN_TIME}")
-        
-        # Check stop times <= 100
-        if any(data['stop_percent'] > self.MAX_TIME):
-            raise ValidationError(f"Stop times must be <= {self.MAX_TIME}")
+        starts = np.asarray(data['start_percent'])
+        stops = np.asarray(data['stop_percent'])
+        sizes = np.asarray(data['group_size'])
         
-        # Check start < stop for each group
-        if any(data['start_percent'] >= data['stop_percent']):
-            raise ValidationError("Start time must be before stop time for all groups")
+        # Constraints are stated as what valid rows satisfy, so NaN fails them
+        checks = [
+            (starts >= self.MIN_TIME, f"Start times must be >= {self.MIN_TIME}"),
+            (stops <= self.MAX_TIME, f"Stop times must be <= {self.MAX_TIME}"),
+            (starts < stops, "Start time must be before stop time for all groups"),
+            (sizes > 0, "Group size must be positive"),
+        ]
         
-        # Check group sizes are positive
-        if any(data['group_size'] <= 0):
-            raise ValidationError("Group size must be positive")
+        # One combined mask answers the common all-valid case; on failure the
+        # individual masks say which constraint the first bad row broke
+        valid = checks[0][0] & checks[1][0] & checks[2][0] & checks[3][0]
+        if not valid.all():
+            row = int(valid.argmin())
+            message = next(msg for mask, msg in checks if not mask[row])
+            raise ValidationError(f"{message} (row {row})")
         
         return True
     
-    def get_total_participants(self, data: pd.DataFrame) -> int:
+    def get_total_participants(self, data: GroupFrame) -> int:
         """Calculate total number of participants across all groups.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             
         Returns:
             Total number of participants
         """
         return int(data['group_size'].sum())
     
-    def get_summary(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def get_summary(self, data: GroupFrame) -> Dict[str, Any]:
         """Get summary statistics from the data.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             
         Returns:
             Dictionary with summary statistics
         """
+        # Extract each column once; the size total also gives the mean
+        sizes = np.asarray(data['group_size'])
+        total = int(sizes.sum())
+        
         return {
             'num_groups': len(data),
-            'total_participants': self.get_total_participants(data),
-            'earliest_start': float(data['start_percent'].min()),
-            'latest_stop': float(data['stop_percent'].max()),
-            'avg_group_size': float(data['group_size'].mean()),
-            'min_group_size': int(data['group_size'].min()),
-            'max_group_size': int(data['group_size'].max())
+            'total_participants': total,
+            'earliest_start': float(np.asarray(data['start_percent']).min()),
+            'latest_stop': float(np.asarray(data['stop_percent']).max()),
+            'avg_group_size': total / len(sizes),
+            'min_group_size': int(sizes.min()),
+            'max_group_size': int(sizes.max())
         }
 
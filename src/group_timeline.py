@@ -8,9 +8,48 @@ This module provides functionality to:
 - Format display tables showing when groups are active
 """
 
+import functools
+import heapq
 import pandas as pd
 import numpy as np
-from typing import Tuple, List, Dict, Any, Set
+from collections import OrderedDict
+from typing import Tuple, List, Dict, Any, Set, Iterable, Optional
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Optional: timelines fall back to the NumPy broadcast
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Below this many matrix cells the NumPy broadcast wins over Numba dispatch
+NUMBA_MIN_CELLS = 1_000_000
+
+# From this many time points, filling each group's active run as one slice
+# beats comparing every cell
+SLICE_FILL_MIN_POINTS = 512
+
+
+@functools.lru_cache(maxsize=8)
+def _time_points(num_points: int, start: float, end: float) -> np.ndarray:
+    """Cached, read-only np.linspace(start, end, num_points)."""
+    points = np.linspace(start, end, num_points)
+    points.setflags(write=False)
+    return points
+
+
+def _fill_timeline(starts, stops, time_points, out):
+    """Write one group's activity row per (parallel) iteration."""
+    for g in prange(len(starts)):
+        start = starts[g]
+        stop = stops[g]
+        for j in range(len(time_points)):
+            t = time_points[j]
+            out[g, j] = 1 if start <= t and t <= stop else 0
+
+
+if NUMBA_AVAILABLE:
+    _fill_timeline = njit(parallel=True)(_fill_timeline)
 
 
 class TimelineGenerator:
@@ -26,9 +65,9 @@ class TimelineGenerator:
             end: End time (default 100)
             
         Returns:
-            Array of time points
+            Read-only array of time points (shared between calls)
         """
-        return np.linspace(start, end, num_points)
+        return _time_points(num_points, start, end)
     
     @staticmethod
     def is_active(time: float, start: float, stop: float) -> int:
@@ -55,78 +94,170 @@ class GroupTimeline:
     - Format display tables
     """
     
+    REPORT_CACHE_SIZE = 32
+    MATRIX_CACHE_SIZE = 32
+    REPORT_PARTS = ('timeline_table', 'timeline_matrix', 'time_points',
+                    'overlapping_groups', 'concurrent_stats')
+    
     def __init__(self):
         """Initialize the timeline analyzer."""
         self.generator = TimelineGenerator()
+        self._report_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._matrix_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        # Concurrency stats of cached matrices, by id(matrix); the matrix is
+        # kept alongside so a recycled id can't match
+        self._stats_cache: Dict[int, Tuple[np.ndarray, Optional[Dict[str, Any]]]] = {}
     
     def generate_timeline(self, data: pd.DataFrame, num_points: int = 20) -> Tuple[np.ndarray, np.ndarray]:
         """Generate activity timeline matrix.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             num_points: Number of time points to sample
             
         Returns:
             Tuple of (activity_matrix, time_points)
-            - activity_matrix: Shape (num_groups, num_points) with 0/1 values
+            - activity_matrix: Shape (num_groups, num_points), uint8 0/1 values
             - time_points: Array of time values
+            
+        Matrices are cached per instance, keyed on the start/stop times and
+        num_points. The returned arrays are read-only.
         """
         time_points = self.generator.create_time_points(num_points)
-        num_groups = len(data)
+        starts = np.asarray(data['start_percent'])
+        stops = np.asarray(data['stop_percent'])
         
-        # Create matrix: rows = groups, columns = time points
-        matrix = np.zeros((num_groups, num_points), dtype=int)
+        key = (tuple(starts.tolist()), tuple(stops.tolist()), num_points)
+        matrix = self._matrix_cache.get(key)
+        if matrix is not None:
+            self._matrix_cache.move_to_end(key)
+            return matrix, time_points
         
-        for i, row in data.iterrows():
-            start = row['start_percent']
-            stop = row['stop_percent']
-            
-            for j, time in enumerate(time_points):
-                matrix[i, j] = self.generator.is_active(time, start, stop)
+        # Create matrix: rows = groups, columns = time points. The compiled
+        # kernel only pays off once compile/dispatch is amortized
+        if NUMBA_AVAILABLE and len(starts) * len(time_points) >= NUMBA_MIN_CELLS:
+            matrix = np.empty((len(starts), len(time_points)), dtype=np.uint8)
+            _fill_timeline(starts.astype(float), stops.astype(float), time_points, matrix)
+        elif num_points >= SLICE_FILL_MIN_POINTS:
+            # Each group is active over one contiguous run of time points
+            lo = np.searchsorted(time_points, starts, side='left')
+            hi = np.searchsorted(time_points, stops, side='right')
+            matrix = np.zeros((len(starts), len(time_points)), dtype=np.uint8)
+            for g, (first, last) in enumerate(zip(lo.tolist(), hi.tolist())):
+                matrix[g, first:last] = 1
+        else:
+            matrix = ((starts[:, None] <= time_points[None, :]) &
+                      (time_points[None, :] <= stops[:, None])).astype(np.uint8)
+        
+        # Cached matrices are shared between callers, so freeze them
+        matrix.setflags(write=False)
+        self._matrix_cache[key] = matrix
+        self._stats_cache[id(matrix)] = (matrix, None)
+        if len(self._matrix_cache) > self.MATRIX_CACHE_SIZE:
+            _, evicted = self._matrix_cache.popitem(last=False)
+            self._stats_cache.pop(id(evicted), None)
         
         return matrix, time_points
     
+    def generate_timeline_bits(self, data: pd.DataFrame, num_points: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate the activity timeline packed one bit per time point.
+        
+        Args:
+            data: GroupData or DataFrame with group scheduling data
+            num_points: Number of time points to sample
+            
+        Returns:
+            Tuple of (activity_bits, time_points)
+            - activity_bits: Shape (num_groups, ceil(num_points / 64)), uint64;
+              bit j % 64 of word j // 64 is matrix[:, j] of generate_timeline()
+            - time_points: Array of time values
+        """
+        matrix, time_points = self.generate_timeline(data, num_points)
+        
+        # Pad each row to whole 64-bit words before reinterpreting the bytes
+        num_words = -(-num_points // 64)
+        packed = np.zeros((len(matrix), num_words * 8), dtype=np.uint8)
+        packed[:, :-(-num_points // 8)] = np.packbits(matrix, axis=1, bitorder='little')
+        
+        return packed.view('<u8'), time_points
+    
+    @staticmethod
+    def concurrent_counts_from_bits(bits: np.ndarray, num_points: int) -> np.ndarray:
+        """Number of active groups at each time point of a packed timeline.
+        
+        Args:
+            bits: Packed activity matrix from generate_timeline_bits()
+            num_points: Number of time points the timeline was sampled at
+            
+        Returns:
+            Array of length num_points, equal to generate_timeline()'s matrix.sum(axis=0)
+        """
+        rows = np.ascontiguousarray(bits, dtype='<u8').view(np.uint8)
+        return np.unpackbits(rows, axis=1, count=num_points, bitorder='little').sum(axis=0)
+    
     def get_overlapping_groups(self, data: pd.DataFrame) -> List[Tuple[int, int]]:
         """Identify pairs of groups that overlap in time.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             
         Returns:
             List of tuples (group_id1, group_id2) for overlapping groups
         """
-        overlaps = []
+        starts = np.asarray(data['start_percent'])
+        stops = np.asarray(data['stop_percent'])
+        group_ids = np.asarray(data['group_id'])
         
-        for i, row1 in data.iterrows():
-            for j, row2 in data.iterrows():
-                if i >= j:  # Avoid duplicates and self-comparison
-                    continue
-                
-                # Check if time ranges overlap
-                # Overlap if: start1 < stop2 AND start2 < stop1
-                if (row1['start_percent'] < row2['stop_percent'] and 
-                    row2['start_percent'] < row1['stop_percent']):
-                    overlaps.append((int(row1['group_id']), int(row2['group_id'])))
+        # Sweep in start order, keeping a heap of (stop, row) for groups
+        # still running. Overlap if: start1 < stop2 AND start2 < stop1, so
+        # groups that merely touch are retired before the next start.
+        pairs = []
+        active: List[Tuple[float, int]] = []
+        for i in np.argsort(starts, kind='stable').tolist():
+            start, stop = starts[i], stops[i]
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            pairs.extend((min(i, j), max(i, j)) for _, j in active if starts[j] < stop)
+            heapq.heappush(active, (stop, i))
         
-        return overlaps
+        # Report in row order, first group of each pair first
+        pairs.sort()
+        return [(int(group_ids[i]), int(group_ids[j])) for i, j in pairs]
     
     def get_active_groups_at_time(self, data: pd.DataFrame, time: float) -> List[int]:
         """Get list of groups active at specific time.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             time: Time point to check (0-100)
             
         Returns:
             List of group IDs active at the given time
         """
-        active = []
+        starts = np.asarray(data['start_percent'])
+        stops = np.asarray(data['stop_percent'])
+        group_ids = np.asarray(data['group_id'])
+        
+        return group_ids[(starts <= time) & (time <= stops)].tolist()
+    
+    def get_active_groups_at_times(self, data: pd.DataFrame, times: Iterable[float]) -> List[List[int]]:
+        """Get lists of groups active at several times.
         
-        for _, row in data.iterrows():
-            if row['start_percent'] <= time <= row['stop_percent']:
-                active.append(int(row['group_id']))
+        Args:
+            data: GroupData or DataFrame with group scheduling data
+            times: Time points to check (0-100)
+            
+        Returns:
+            One list of active group IDs per time, as get_active_groups_at_time()
+        """
+        starts = np.asarray(data['start_percent'])
+        stops = np.asarray(data['stop_percent'])
+        group_ids = np.asarray(data['group_id'])
+        times = np.fromiter(times, dtype=float)
         
-        return active
+        # Rows = times, columns = groups
+        active = (starts[None, :] <= times[:, None]) & (times[:, None] <= stops[None, :])
+        return [group_ids[row].tolist() for row in active]
     
     def get_concurrent_stats(self, matrix: np.ndarray) -> Dict[str, Any]:
         """Calculate statistics about concurrent group activity.
@@ -142,15 +273,88 @@ class GroupTimeline:
             - times_with_zero: Number of time points with no groups
             - times_with_max: Number of time points at maximum concurrency
         """
+        # Matrices from generate_timeline() are read-only, so their stats
+        # can be computed once and reused
+        entry = self._stats_cache.get(id(matrix))
+        if entry is not None and entry[0] is matrix and entry[1] is not None:
+            return dict(entry[1])
+        
         # Sum across groups (rows) to get concurrent count at each time
         concurrent = np.sum(matrix, axis=0)
+        peak = np.max(concurrent)
         
-        return {
-            'max_concurrent': int(np.max(concurrent)),
+        stats = {
+            'max_concurrent': int(peak),
             'min_concurrent': int(np.min(concurrent)),
             'avg_concurrent': float(np.mean(concurrent)),
             'times_with_zero': int(np.sum(concurrent == 0)),
-            'times_with_max': int(np.sum(concurrent == np.max(concurrent)))
+            'times_with_max': int(np.sum(concurrent == peak))
+        }
+        
+        if entry is not None and entry[0] is matrix:
+            self._stats_cache[id(matrix)] = (matrix, stats)
+        return dict(stats)
+    
+    def concurrent_profile(self, data: pd.DataFrame, start: float = 0,
+                           end: float = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact number of active groups over time, as a step function.
+        
+        Computed from the sorted start/stop endpoints, so the cost depends
+        only on the number of groups, not on any sampling resolution.
+        
+        Args:
+            data: GroupData or DataFrame with group scheduling data
+            start: Start of the time range (default 0)
+            end: End of the time range (default 100)
+            
+        Returns:
+            Tuple of (edges, counts)
+            - edges: Sorted event times bounding the segments, including start and end
+            - counts: counts[k] groups are active strictly between edges[k] and edges[k+1]
+        """
+        starts = np.sort(np.asarray(data['start_percent']))
+        stops = np.sort(np.asarray(data['stop_percent']))
+        
+        edges = np.unique(np.concatenate([[start, end], starts, stops]))
+        edges = edges[(edges >= start) & (edges <= end)]
+        
+        # Groups started at or before a segment's left edge minus those stopped
+        counts = (np.searchsorted(starts, edges[:-1], side='right') -
+                  np.searchsorted(stops, edges[:-1], side='right'))
+        
+        return edges, counts
+    
+    def get_exact_concurrent_stats(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Calculate concurrency statistics from the exact activity profile.
+        
+        Unlike get_concurrent_stats(), the results do not depend on how many
+        time points the timeline matrix was sampled at.
+        
+        Args:
+            data: GroupData or DataFrame with group scheduling data
+            
+        Returns:
+            Dictionary with statistics:
+            - max_concurrent: Maximum number of groups active at once
+            - min_concurrent: Minimum number of groups active
+            - avg_concurrent: Time-weighted average number of groups active
+            - time_with_zero: Total time (percent) with no groups active
+        """
+        edges, counts = self.concurrent_profile(data)
+        durations = np.diff(edges)
+        
+        # Intervals are closed, so a group stopping exactly where another
+        # starts counts both at that instant
+        starts = np.sort(np.asarray(data['start_percent']))
+        stops = np.sort(np.asarray(data['stop_percent']))
+        at_edges = (np.searchsorted(starts, edges, side='right') -
+                    np.searchsorted(stops, edges, side='left'))
+        
+        return {
+            'max_concurrent': int(np.max(at_edges)),
+            'min_concurrent': int(np.min(counts)),
+            'avg_concurrent': float(np.sum(counts * durations) / np.sum(durations)),
+            'time_with_zero': float(np.sum(durations[counts == 0]))
         }
     
     def format_as_table(self, matrix: np.ndarray, time_points: np.ndarray, 
@@ -168,51 +372,86 @@ class GroupTimeline:
         lines = []
         
         # Header
-        header = "Time%  |"
-        for _, row in data.iterrows():
-            header += f" Group{row['group_id']:2d} |"
-        header += " Total |"
+        header = ("Time%  |" + "".join(f" Group{g:2d} |" for g in np.asarray(data['group_id'])) +
+                  " Total |")
         lines.append(header)
         lines.append("-" * len(header))
         
-        # Data rows
-        for j, time in enumerate(time_points):
-            row_str = f"{time:5.1f}  |"
-            for i in range(matrix.shape[0]):
-                row_str += f"   {matrix[i, j]}    |"
-            
-            # Add total concurrent
-            total = np.sum(matrix[:, j])
-            row_str += f"   {total}   |"
-            lines.append(row_str)
+        # Data rows, with total concurrent in the last column. Cells are
+        # formatted once per distinct value and looked up per time point
+        totals = matrix.sum(axis=0)
+        cells = {v: f"   {v}    |" for v in np.unique(matrix).tolist()}
+        lines.extend(
+            f"{time:5.1f}  |" + "".join(map(cells.__getitem__, column)) + f"   {total}   |"
+            for time, column, total in zip(time_points, matrix.T.tolist(), totals.tolist())
+        )
         
         return "\n".join(lines)
     
-    def generate_report(self, data: pd.DataFrame, num_points: int = 20) -> Dict[str, Any]:
+    def generate_report(self, data: pd.DataFrame, num_points: int = 20,
+                        parts: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """Generate complete timeline analysis report.
         
         Args:
-            data: DataFrame with group scheduling data
+            data: GroupData or DataFrame with group scheduling data
             num_points: Number of time points to sample
+            parts: Report entries to build (default: all of REPORT_PARTS);
+                skipping 'timeline_table' avoids formatting the table
             
         Returns:
-            Dictionary containing:
+            Dictionary containing the requested parts:
             - timeline_table: Formatted timeline table string
             - timeline_matrix: Activity matrix
             - time_points: Time point values
             - overlapping_groups: List of overlapping group pairs
             - concurrent_stats: Concurrency statistics
+            
+        Raises:
+            ValueError: If an unknown part is requested
+            
+        Reports are cached per instance, keyed on the group data and
+        num_points; parts are added to the cached entry as they are first
+        requested. The returned arrays are read-only.
         """
-        matrix, time_points = self.generate_timeline(data, num_points)
-        overlaps = self.get_overlapping_groups(data)
-        stats = self.get_concurrent_stats(matrix)
-        table = self.format_as_table(matrix, time_points, data)
+        requested = self.REPORT_PARTS if parts is None else tuple(parts)
+        unknown = set(requested) - set(self.REPORT_PARTS)
+        if unknown:
+            raise ValueError(f"Unknown report parts: {sorted(unknown)}")
         
-        return {
-            'timeline_table': table,
-            'timeline_matrix': matrix,
-            'time_points': time_points,
-            'overlapping_groups': overlaps,
-            'concurrent_stats': stats
-        }
-
+        key = (
+            tuple(data['group_id']), tuple(data['group_size']),
+            tuple(data['start_percent']), tuple(data['stop_percent']),
+            num_points
+        )
+        
+        report = self._report_cache.get(key)
+        if report is None:
+            report = {}
+            self._report_cache[key] = report
+            if len(self._report_cache) > self.REPORT_CACHE_SIZE:
+                self._report_cache.popitem(last=False)
+        else:
+            self._report_cache.move_to_end(key)
+        
+        # Build only the missing parts that were asked for
+        needs_matrix = {'timeline_table', 'timeline_matrix', 'time_points', 'concurrent_stats'}
+        if needs_matrix.intersection(requested) and 'timeline_matrix' not in report:
+            matrix, time_points = self.generate_timeline(data, num_points)
+            report['timeline_matrix'] = matrix
+            report['time_points'] = time_points
+        if 'overlapping_groups' in requested and 'overlapping_groups' not in report:
+            report['overlapping_groups'] = self.get_overlapping_groups(data)
+        if 'concurrent_stats' in requested and 'concurrent_stats' not in report:
+            report['concurrent_stats'] = self.get_concurrent_stats(report['timeline_matrix'])
+        if 'timeline_table' in requested and 'timeline_table' not in report:
+            report['timeline_table'] = self.format_as_table(
+                report['timeline_matrix'], report['time_points'], data
+            )
+        
+        # Fresh containers so callers can't mutate the cached entry
+        result = {part: report[part] for part in requested}
+        if 'overlapping_groups' in result:
+            result['overlapping_groups'] = list(result['overlapping_groups'])
+        if 'concurrent_stats' in result:
+            result['concurrent_stats'] = dict(result['concurrent_stats'])
+        return result
@@ -10,13 +10,32 @@ Usage:
     python src/main.py data/sample_groups.csv
 """
 
+import os
 import sys
 import argparse
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from group_scheduler import GroupScheduler, ValidationError
 
 
+def write_atomic(path: Path, text: str):
+    """Write text to path in one buffer, replacing any existing file atomically."""
+    payload = memoryview(text.encode())
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def main():
     """Main entry point for the group scheduler program."""
     parser = argparse.ArgumentParser(
@@ -79,7 +98,7 @@ def main():
     # Display data
     print("📊 Group Data:")
     print("-" * 60)
-    print(data.to_string(index=False))
+    print(data.to_dataframe().to_string(index=False))
     print()
     
     # Display summary
@@ -98,12 +117,18 @@ def main():
         print()
         print(f"⏱️  Total Time: {args.total_time} minutes")
         print("-" * 60)
-        for _, row in data.iterrows():
-            start_min = (row['start_percent'] / 100) * args.total_time
-            stop_min = (row['stop_percent'] / 100) * args.total_time
-            duration = stop_min - start_min
-            print(f"Group {row['group_id']}: {start_min:.1f} - {stop_min:.1f} min "
-                  f"(duration: {duration:.1f} min, {row['group_size']} people)")
+        factor = args.total_time / 100
+        start_mins = data['start_percent'] * factor
+        stop_mins = data['stop_percent'] * factor
+        durations = stop_mins - start_mins
+        print("\n".join(
+            f"Group {group_id}: {start_min:.1f} - {stop_min:.1f} min "
+            f"(duration: {duration:.1f} min, {group_size} people)"
+            for group_id, group_size, start_min, stop_min, duration in zip(
+                data['group_id'], data['group_size'],
+                start_mins, stop_mins, durations
+            )
+        ))
     
     print()
     print("=" * 60)
@@ -114,18 +139,19 @@ def main():
     output_dir.mkdir(exist_ok=True)
     
     summary_file = output_dir / f"{timestamp}_group_summary.txt"
-    with open(summary_file, 'w') as f:
-        f.write("Group Scheduler Summary\n")
-        f.write("=" * 60 + "\n\n")
-        f.write(f"Input file: {args.csv_file}\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write("Group Data:\n")
-        f.write("-" * 60 + "\n")
-        f.write(data.to_string(index=False) + "\n\n")
-        f.write("Summary Statistics:\n")
-        f.write("-" * 60 + "\n")
-        for key, value in summary.items():
-            f.write(f"{key}: {value}\n")
+    chunks = [
+        "Group Scheduler Summary\n",
+        "=" * 60 + "\n\n",
+        f"Input file: {args.csv_file}\n",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        "Group Data:\n",
+        "-" * 60 + "\n",
+        data.to_dataframe().to_string(index=False) + "\n\n",
+        "Summary Statistics:\n",
+        "-" * 60 + "\n",
+    ]
+    chunks.extend(f"{key}: {value}\n" for key, value in summary.items())
+    write_atomic(summary_file, "".join(chunks))
     
     print(f"📄 Summary saved to: {summary_file}")
     print()
@@ -7,12 +7,17 @@ Generates objects with 3D positions and tracks their movement over time.
 """
 
 import argparse
+import contextlib
+import io
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict
-from spatial_groups import SpatialGroupSimulator
+from functools import reduce
+from typing import Dict, Optional
+from spatial_groups import SpatialGroupSimulator, PYARROW_AVAILABLE
 
 
 def create_example_scenarios() -> Dict[str, pd.DataFrame]:
@@ -102,6 +107,14 @@ def create_example_scenarios() -> Dict[str, pd.DataFrame]:
     return scenarios
 
 
+def format_positions(north: np.ndarray, east: np.ndarray, down: np.ndarray,
+                     decimals: int = 1) -> np.ndarray:
+    """Format coordinate arrays as "(N, E, D)" strings in one vectorized pass."""
+    fmt = f'%.{decimals}f'
+    n, e, d = (np.char.mod(fmt, np.asarray(a, dtype=float)) for a in (north, east, down))
+    return reduce(np.char.add, ['(', n, ', ', e, ', ', d, ')'])
+
+
 def print_scenario_summary(name: str, simulator: SpatialGroupSimulator, objects_df: pd.DataFrame):
     """Print summary of a scenario."""
     print(f"\n{'='*80}")
@@ -133,24 +146,31 @@ def print_scenario_summary(name: str, simulator: SpatialGroupSimulator, objects_
     print(f"Sample Objects (first 10):")
     print(f"{'-'*80}")
     
-    sample_df = objects_df.head(10).copy()
-    sample_df['start_pos'] = sample_df.apply(
-        lambda r: f"({r['start_north']:.1f}, {r['start_east']:.1f}, {r['start_down']:.1f})", axis=1
-    )
-    sample_df['end_pos'] = sample_df.apply(
-        lambda r: f"({r['end_north']:.1f}, {r['end_east']:.1f}, {r['end_down']:.1f})", axis=1
-    )
-    
-    display_cols = ['object_id', 'group_id', 'category', 'start_pos', 'end_pos', 'travel_distance']
-    print(sample_df[display_cols].to_string(index=False))
+    sample_df = objects_df.head(10)
+    display_df = pd.DataFrame({
+        'object_id': sample_df['object_id'].to_numpy(),
+        'group_id': sample_df['group_id'].to_numpy(),
+        'category': sample_df['category'].to_numpy(),
+        'start_pos': format_positions(
+            sample_df['start_north'], sample_df['start_east'], sample_df['start_down']
+        ),
+        'end_pos': format_positions(
+            sample_df['end_north'], sample_df['end_east'], sample_df['end_down']
+        ),
+        'travel_distance': sample_df['travel_distance'].to_numpy()
+    })
+    print(display_df.to_string(index=False))
     
     # Time overlap analysis
     print(f"\n{'-'*80}")
     print(f"Group Time Windows:")
     print(f"{'-'*80}")
     
-    for _, group in simulator.groups_df.iterrows():
-        print(f"  Group {int(group['group_id'])}: {group['start_percent']:.1f}% - {group['stop_percent']:.1f}%")
+    groups_df = simulator.groups_df
+    for gid, start, stop in zip(groups_df['group_id'].to_numpy(dtype=int),
+                                groups_df['start_percent'].to_numpy(dtype=float),
+                                groups_df['stop_percent'].to_numpy(dtype=float)):
+        print(f"  Group {gid}: {start:.1f}% - {stop:.1f}%")
 
 
 def print_trajectory_sample(name: str, trajectory_df: pd.DataFrame, num_samples: int = 5):
@@ -163,14 +183,77 @@ def print_trajectory_sample(name: str, trajectory_df: pd.DataFrame, num_samples:
     first_object_id = trajectory_df['object_id'].iloc[0]
     obj_traj = trajectory_df[trajectory_df['object_id'] == first_object_id].head(num_samples)
     
-    obj_traj['position'] = obj_traj.apply(
-        lambda r: f"({r['north']:.2f}, {r['east']:.2f}, {r['down']:.2f})", axis=1
+    obj_traj['position'] = format_positions(
+        obj_traj['north'], obj_traj['east'], obj_traj['down'], decimals=2
     )
     
     display_cols = ['time_percent', 'position']
     print(obj_traj[display_cols].to_string(index=False))
 
 
+def _run_scenario(name: str, groups_df: pd.DataFrame, time_points: int, seed: int,
+                  save: bool, output_dir: Path, timestamp: str, file_format: str = 'csv') -> str:
+    """
+    Simulate one scenario and return its printed report.
+    
+    Module-level so it can run in a worker process; output is captured and
+    returned so the parent can print scenarios in order.
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        simulator = SpatialGroupSimulator(
+            groups_df,
+            num_time_points=time_points,
+            random_seed=seed
+        )
+        objects_df = simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        
+        print_scenario_summary(name, simulator, objects_df)
+        print_trajectory_sample(name, trajectory_df)
+        
+        if save:
+            simulator.save_outputs(output_dir, prefix=f"{timestamp}_{name}", file_format=file_format)
+            print(f"\nOutputs saved to: {output_dir}")
+    
+    return buffer.getvalue()
+
+
+def run_scenarios(scenarios: Dict[str, pd.DataFrame], time_points: int, seed: int,
+                  save: bool, output_dir: Path, timestamp: str,
+                  workers: Optional[int] = None, file_format: str = 'csv'):
+    """
+    Run independent scenarios across worker processes, printing in order.
+    
+    Args:
+        scenarios: Dictionary mapping scenario name to groups DataFrame
+        time_points: Number of time points to simulate
+        seed: Random seed for each scenario's simulator
+        save: Whether to save outputs
+        output_dir: Directory for output files
+        timestamp: Prefix timestamp for output files
+        workers: Worker processes (default: one per scenario, up to CPU count);
+            1 runs everything in this process
+        file_format: Output file format passed to save_outputs
+    """
+    if workers is None:
+        workers = min(len(scenarios), os.cpu_count() or 1)
+    
+    jobs = [
+        (name, groups_df, time_points, seed, save, output_dir, timestamp, file_format)
+        for name, groups_df in scenarios.items()
+    ]
+    
+    if workers <= 1:
+        for job in jobs:
+            print(_run_scenario(*job), end='')
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for report in executor.map(_run_scenario, *zip(*jobs)):
+            print(report, end='')
+
+
 def main():
     """Main execution function."""
     parser = argparse.ArgumentParser(
@@ -204,6 +287,18 @@ def main():
         default=Path('results'),
         help='Directory for output files (default: results/)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for example scenarios (default: one per scenario, up to CPU count)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='parquet' if PYARROW_AVAILABLE else 'csv',
+        help='Output file format (default: parquet if pyarrow is installed, else csv)'
+    )
     
     args = parser.parse_args()
     
@@ -225,7 +320,8 @@ def main():
         print_trajectory_sample("custom_scenario", trajectory_df)
         
         if args.save:
-            files = simulator.save_outputs(args.output_dir, prefix=f"{timestamp}_custom")
+            files = simulator.save_outputs(args.output_dir, prefix=f"{timestamp}_custom",
+                                           file_format=args.format)
             print(f"\n{'='*80}")
             print("Outputs saved:")
             for ftype, fpath in files.items():
@@ -240,21 +336,9 @@ def main():
         
         scenarios = create_example_scenarios()
         
-        for name, groups_df in scenarios.items():
-            simulator = SpatialGroupSimulator(
-                groups_df,
-                num_time_points=args.time_points,
-                random_seed=args.seed
-            )
-            objects_df = simulator.generate_objects()
-            trajectory_df = simulator.generate_trajectories()
-            
-            print_scenario_summary(name, simulator, objects_df)
-            print_trajectory_sample(name, trajectory_df)
-            
-            if args.save:
-                files = simulator.save_outputs(args.output_dir, prefix=f"{timestamp}_{name}")
-                print(f"\nOutputs saved to: {args.output_dir}")
+        run_scenarios(scenarios, args.time_points, args.seed, args.save,
+                      args.output_dir, timestamp, workers=args.workers,
+                      file_format=args.format)
         
         if args.save:
             print(f"\n{'='*80}")
@@ -6,12 +6,183 @@ in North-East-Down (NED) coordinates over time. Each group has spatial parameter
 including centerpoint, spread, and movement characteristics.
 """
 
+import copy
+import importlib.util
+import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Optional: trajectories fall back to the NumPy implementation
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Optional: enables save_outputs(file_format='parquet'); imported on use
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Below this many trajectory rows the NumPy path wins over Numba dispatch
+NUMBA_MIN_ROWS = 100_000
+
+# Rows formatted per block when streaming CSV output
+CSV_CHUNK_ROWS = 65_536
+
+# Start offsets and travel distances are Gaussian, truncated at this many
+# standard deviations from the group's center/mean
+MAX_SIGMA = 3.0
+
+
+def _write_csv(path: Path, columns: Dict[str, np.ndarray], chunk_rows: Optional[int] = None):
+    """
+    Stream column arrays to a CSV file without building a DataFrame.
+    
+    Integer columns are written as integers, float64 columns with six
+    decimals and float32 columns with seven significant digits (their full
+    precision, so no digits past it are printed). Rows are formatted in
+    blocks so peak memory stays bounded.
+    
+    Args:
+        path: Output file path
+        columns: Mapping of column name to equal-length 1-D array
+        chunk_rows: Number of rows formatted per block (default CSV_CHUNK_ROWS)
+    """
+    with open(path, 'w') as f:
+        _append_csv(f, columns, header=True, chunk_rows=chunk_rows)
+
+
+def _append_csv(f, columns: Dict[str, np.ndarray], header: bool = False,
+                chunk_rows: Optional[int] = None):
+    """
+    Write column arrays as CSV rows to an open text file.
+    
+    Args:
+        f: Open text file
+        columns: Mapping of column name to equal-length 1-D array
+        header: Whether to write the header row first
+        chunk_rows: Number of rows formatted per block (default CSV_CHUNK_ROWS)
+    """
+    chunk_rows = chunk_rows or CSV_CHUNK_ROWS
+    names = list(columns)
+    arrays = [np.asarray(columns[name]) for name in names]
+    fmt = ','.join('%d' if np.issubdtype(a.dtype, np.integer) else
+                   '%.7g' if a.dtype == np.float32 else '%.6f' for a in arrays)
+    num_rows = len(arrays[0]) if arrays else 0
+    
+    if header:
+        f.write(','.join(names) + '\n')
+    for lo in range(0, num_rows, chunk_rows):
+        block = np.column_stack([a[lo:lo + chunk_rows] for a in arrays])
+        np.savetxt(f, block, fmt=fmt)
+
+
+def _json_default(value):
+    """Convert NumPy scalars (and anything else) for json serialization."""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _write_parquet(path: Path, columns: Dict[str, np.ndarray]):
+    """
+    Write column arrays to a snappy-compressed Parquet file.
+    
+    Args:
+        path: Output file path
+        columns: Mapping of column name to equal-length 1-D array
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    pq.write_table(pa.table(columns), path, compression='snappy')
+
+
+# Trajectory positions are only plotted or written at a few decimals, so they
+# are stored in single precision to halve memory and bandwidth. time_percent
+# stays float64: it holds exact window bounds and grid points
+TRAJECTORY_DTYPE = np.float32
+
+
+def _fill_trajectories_numpy(time_points, lo, need_start, need_stop, counts,
+                             start_percent, stop_percent, start_pos, end_pos):
+    """Vectorized trajectory layout and interpolation.
+    
+    Interpolation is done in float64; positions are stored as TRAJECTORY_DTYPE.
+    
+    Returns:
+        Tuple of (obj, t, pos): object index, time and (N, E, D) position per row
+    """
+    num_times = len(time_points)
+    
+    # Flatten to one row per (object, time): obj indexes the object and
+    # step is the position within that object's active times
+    obj = np.repeat(np.arange(len(counts)), counts)
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    
+    inside_idx = np.clip(lo[obj] + step - need_start[obj], 0, num_times - 1)
+    t = time_points[inside_idx]
+    t = np.where(need_start[obj] & (step == 0), start_percent[obj], t)
+    t = np.where(need_stop[obj] & (step == counts[obj] - 1), stop_percent[obj], t)
+    
+    # Interpolation factor (0 at start_percent, 1 at stop_percent)
+    window = (stop_percent - start_percent)[obj]
+    alpha = np.divide(t - start_percent[obj], window,
+                      out=np.zeros_like(t), where=window != 0)
+    
+    # Linear interpolation between start and end positions
+    pos = start_pos[obj] + alpha[:, None] * (end_pos - start_pos)[obj]
+    
+    return obj, t, pos.astype(TRAJECTORY_DTYPE)
+
+
+def _trajectory_kernel(time_points, lo, need_start, need_stop, offsets,
+                       start_percent, stop_percent, start_pos, end_pos,
+                       out_obj, out_t, out_pos):
+    """Fill one object's slice of the output arrays per (parallel) iteration."""
+    for i in prange(len(lo)):
+        first = offsets[i]
+        last = offsets[i + 1]
+        shift = 1 if need_start[i] else 0
+        window = stop_percent[i] - start_percent[i]
+        
+        for r in range(first, last):
+            # Exact start/stop samples bracket the grid points inside the window
+            if need_start[i] and r == first:
+                t = start_percent[i]
+            elif need_stop[i] and r == last - 1:
+                t = stop_percent[i]
+            else:
+                t = time_points[lo[i] + r - first - shift]
+            
+            # Interpolate in float64 and round once on store
+            alpha = (t - start_percent[i]) / window if window != 0 else 0.0
+            out_obj[r] = i
+            out_t[r] = t
+            for c in range(3):
+                out_pos[r, c] = start_pos[i, c] + alpha * (end_pos[i, c] - start_pos[i, c])
+
+
+if NUMBA_AVAILABLE:
+    _trajectory_kernel = njit(parallel=True)(_trajectory_kernel)
+
+
+def _fill_trajectories_numba(time_points, lo, need_start, need_stop, counts,
+                             start_percent, stop_percent, start_pos, end_pos):
+    """Numba-compiled equivalent of _fill_trajectories_numpy."""
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    total = int(offsets[-1])
+    out_obj = np.empty(total, dtype=np.intp)
+    out_t = np.empty(total, dtype=np.float64)
+    out_pos = np.empty((total, 3), dtype=TRAJECTORY_DTYPE)
+    
+    _trajectory_kernel(time_points, lo, need_start, need_stop, offsets,
+                       start_percent, stop_percent,
+                       np.ascontiguousarray(start_pos), np.ascontiguousarray(end_pos),
+                       out_obj, out_t, out_pos)
+    
+    return out_obj, out_t, out_pos
+
 
 class SpatialGroupSimulator:
     """
@@ -40,18 +211,57 @@ class SpatialGroupSimulator:
             num_time_points: Number of time points to simulate (default 100)
             random_seed: Random seed for reproducibility (default None)
         """
-        self.groups_df = groups_df.copy()
+        # Group parameters are only read, never modified, so the caller's
+        # frame is shared rather than copied (cheap parameter sweeps)
+        self.groups_df = groups_df
         self.num_time_points = num_time_points
         self.random_seed = random_seed
-        self.objects_df: Optional[pd.DataFrame] = None
-        self.trajectory_df: Optional[pd.DataFrame] = None
         
-        # Set random seed if provided
-        if random_seed is not None:
-            np.random.seed(random_seed)
+        # Time points (0 to 100 percent) are fixed for the simulator's lifetime
+        self._time_points = np.linspace(0, 100, num_time_points)
+        self._time_points.flags.writeable = False
+        self._objects: Optional[Dict[str, np.ndarray]] = None  # One array per column
+        self._objects_df: Optional[pd.DataFrame] = None
+        self._positions: Optional[Tuple[np.ndarray, np.ndarray]] = None  # (N, 3) start/end blocks
+        self._trajectory: Optional[Dict[str, np.ndarray]] = None  # One array per column
+        self._trajectory_df: Optional[pd.DataFrame] = None
+        self._stats_cache: Optional[Tuple[Dict, Optional[Dict], Dict]] = None
+        
+        # Per-simulator generator: no global RNG state is touched, so
+        # simulators can run independently (e.g. in parallel processes)
+        self._rng = np.random.default_rng(random_seed)
         
         self._validate_groups()
     
+    @property
+    def objects_df(self) -> Optional[pd.DataFrame]:
+        """Objects as a DataFrame, built from the column arrays on first access."""
+        if self._objects is None:
+            return None
+        if self._objects_df is None:
+            self._objects_df = pd.DataFrame(self._objects, copy=False)
+        return self._objects_df
+    
+    @objects_df.setter
+    def objects_df(self, df: Optional[pd.DataFrame]):
+        self._objects = None if df is None else {col: df[col].to_numpy() for col in df.columns}
+        self._objects_df = df
+        self._positions = None
+    
+    @property
+    def trajectory_df(self) -> Optional[pd.DataFrame]:
+        """Trajectories as a DataFrame, built from the column arrays on first access."""
+        if self._trajectory is None:
+            return None
+        if self._trajectory_df is None:
+            self._trajectory_df = pd.DataFrame(self._trajectory, copy=False)
+        return self._trajectory_df
+    
+    @trajectory_df.setter
+    def trajectory_df(self, df: Optional[pd.DataFrame]):
+        self._trajectory = None if df is None else {col: df[col].to_numpy() for col in df.columns}
+        self._trajectory_df = df
+    
     @classmethod
     def from_csv(cls, csv_path: Path, num_time_points: int = 100, random_seed: Optional[int] = None):
         """
@@ -85,31 +295,85 @@ class SpatialGroupSimulator:
         if not self.groups_df['category'].isin([1, 2, 3]).all():
             raise ValueError("Category must be 1, 2, or 3")
         
-        # Validate spread_std (must be positive)
-        if (self.groups_df['spread_std'] <= 0).any():
-            raise ValueError("spread_std must be positive")
-        
-        # Validate mean_travel_distance (must be non-negative)
-        if (self.groups_df['mean_travel_distance'] < 0).any():
-            raise ValueError("mean_travel_distance must be non-negative")
-        
-        # Validate travel_std (must be positive)
-        if (self.groups_df['travel_std'] <= 0).any():
-            raise ValueError("travel_std must be positive")
+        values = self.groups_df[[
+            'spread_std', 'mean_travel_distance', 'travel_std', 'group_size',
+            'start_percent', 'stop_percent'
+        ]].to_numpy(dtype=float)
+        spread_std, mean_travel, travel_std, group_size, start, stop = values.T
+        
+        # Objects store group ids as int32, so larger ids would wrap
+        group_ids = self.groups_df['group_id'].to_numpy()
+        int32 = np.iinfo(np.int32)
+        
+        checks = [
+            ((group_ids < int32.min) | (group_ids > int32.max), "group_id must fit in 32 bits"),
+            (spread_std <= 0, "spread_std must be positive"),
+            (mean_travel < 0, "mean_travel_distance must be non-negative"),
+            (travel_std <= 0, "travel_std must be positive"),
+            (group_size <= 0, "group_size must be positive"),
+            ((start < 0) | (start > 100), "start_percent must be between 0 and 100"),
+            ((stop < 0) | (stop > 100), "stop_percent must be between 0 and 100"),
+            (stop <= start, "stop_percent must be greater than start_percent"),
+        ]
         
-        # Validate group_size (must be positive integer)
-        if (self.groups_df['group_size'] <= 0).any():
-            raise ValueError("group_size must be positive")
+        # One combined mask finds the first offending row; the individual
+        # masks then say which constraint it broke
+        failed = np.logical_or.reduce([mask for mask, _ in checks])
+        if failed.any():
+            row = int(failed.argmax())
+            message = next(msg for mask, msg in checks if mask[row])
+            raise ValueError(f"{message} (row {row})")
+    
+    def _group_rows(self, group_ids: np.ndarray) -> np.ndarray:
+        """
+        Map group ids to row positions in groups_df.
         
-        # Validate time windows
-        if (self.groups_df['start_percent'] < 0).any() or (self.groups_df['start_percent'] > 100).any():
-            raise ValueError("start_percent must be between 0 and 100")
+        Args:
+            group_ids: Array of group ids
+            
+        Returns:
+            Array of row indices, one per input id
+            
+        Raises:
+            ValueError: If an id is not present in groups_df
+        """
+        # Sorted ids map each group_id to its row with one vectorized
+        # searchsorted instead of a scan; they are taken from the live
+        # groups_df, since the shared frame may have changed since __init__
+        ids = self.groups_df['group_id'].to_numpy()
+        order = np.argsort(ids, kind='stable')
+        pos = np.minimum(np.searchsorted(ids[order], group_ids), len(ids) - 1)
+        rows = order[pos]
+        
+        unknown = ids[rows] != group_ids
+        if unknown.any():
+            raise ValueError(f"Unknown group_id: {group_ids[unknown.argmax()]}")
+        return rows
+    
+    def _draw_constrained(self, num: int, dims: int, k: float = MAX_SIGMA) -> np.ndarray:
+        """
+        Draw standard normal vectors whose length is at most k.
         
-        if (self.groups_df['stop_percent'] < 0).any() or (self.groups_df['stop_percent'] > 100).any():
-            raise ValueError("stop_percent must be between 0 and 100")
+        Samples are drawn in bulk with a small over-count and out-of-range
+        rows are rejected; the top-up draw is rarely needed.
         
-        if (self.groups_df['stop_percent'] <= self.groups_df['start_percent']).any():
-            raise ValueError("stop_percent must be greater than start_percent")
+        Args:
+            num: Number of vectors
+            dims: Components per vector
+            k: Maximum vector length
+            
+        Returns:
+            Array of shape (num, dims)
+        """
+        out = np.empty((num, dims))
+        filled = 0
+        while filled < num:
+            need = num - filled
+            z = self._rng.standard_normal((int(need * 1.05) + 8, dims))
+            z = z[np.einsum('ij,ij->i', z, z) <= k * k][:need]
+            out[filled:filled + len(z)] = z
+            filled += len(z)
+        return out
     
     def generate_objects(self) -> pd.DataFrame:
         """
@@ -117,60 +381,134 @@ class SpatialGroupSimulator:
         
         For each group, creates the specified number of objects with:
         - Unique object ID
-        - Starting position (sampled near group centerpoint)
+        - Starting position (sampled near group centerpoint, within
+          MAX_SIGMA * spread_std)
         - Ending position (after travel distance)
-        - Travel distance (sampled from group distribution)
+        - Travel distance (sampled from group distribution, within
+          MAX_SIGMA * travel_std of the mean)
         - Category (inherited from group)
         
         Returns:
             DataFrame with object parameters
         """
-        objects_list = []
-        object_counter = 1
+        sizes = self.groups_df['group_size'].to_numpy(dtype=int)
+        num_objects = int(sizes.sum())
         
-        for _, group in self.groups_df.iterrows():
-            group_id = int(group['group_id'])
-            group_size = int(group['group_size'])
-            
-            # Group spatial parameters
-            center = np.array([group['center_north'], group['center_east'], group['center_down']])
-            spread_std = group['spread_std']
-            mean_travel = group['mean_travel_distance']
-            travel_std = group['travel_std']
-            category = int(group['category'])
-            
-            for _ in range(group_size):
-                # Generate starting position (near group center)
-                start_pos = center + np.random.randn(3) * spread_std
-                
-                # Generate travel distance
-                travel_distance = max(0, np.random.randn() * travel_std + mean_travel)
-                
-                # Generate random direction for movement
-                direction = np.random.randn(3)
-                direction = direction / np.linalg.norm(direction)  # Normalize
-                
-                # Calculate ending position
-                end_pos = start_pos + direction * travel_distance
-                
-                objects_list.append({
-                    'object_id': object_counter,
-                    'group_id': group_id,
-                    'category': category,
-                    'start_north': start_pos[0],
-                    'start_east': start_pos[1],
-                    'start_down': start_pos[2],
-                    'end_north': end_pos[0],
-                    'end_east': end_pos[1],
-                    'end_down': end_pos[2],
-                    'travel_distance': travel_distance
-                })
-                
-                object_counter += 1
-        
-        self.objects_df = pd.DataFrame(objects_list)
+        # Expand group parameters to one row per object: the float columns
+        # are extracted as one block and repeated in a single call
+        params = np.repeat(self.groups_df[[
+            'center_north', 'center_east', 'center_down',
+            'spread_std', 'mean_travel_distance', 'travel_std'
+        ]].to_numpy(dtype=float), sizes, axis=0)
+        centers = params[:, :3]
+        spread_std, mean_travel, travel_std = params[:, 3], params[:, 4], params[:, 5]
+        
+        # Generate starting positions (near group center)
+        start_pos = centers + self._draw_constrained(num_objects, 3) * spread_std[:, None]
+        
+        # Generate travel distances
+        travel_distance = np.maximum(0, self._draw_constrained(num_objects, 1)[:, 0] * travel_std + mean_travel)
+        
+        # Generate random directions for movement
+        direction = self._rng.standard_normal((num_objects, 3))
+        # Normalize: row-wise squared norms via einsum avoid a direction**2 temporary
+        direction /= np.sqrt(np.einsum('ij,ij->i', direction, direction))[:, None]
+        
+        # Calculate ending positions
+        end_pos = start_pos + direction * travel_distance[:, None]
+        
+        # Typed column arrays: the DataFrame wraps them without inference or
+        # copies. Position columns are views into the (N, 3) blocks, which
+        # are kept for generate_trajectories()
+        self._positions = (start_pos, end_pos)
+        self._objects = {
+            'object_id': np.arange(1, num_objects + 1, dtype=np.int32),
+            'group_id': np.repeat(self.groups_df['group_id'].to_numpy(dtype=np.int32), sizes),
+            'category': np.repeat(self.groups_df['category'].to_numpy(dtype=np.int8), sizes),
+            'start_north': start_pos[:, 0],
+            'start_east': start_pos[:, 1],
+            'start_down': start_pos[:, 2],
+            'end_north': end_pos[:, 0],
+            'end_east': end_pos[:, 1],
+            'end_down': end_pos[:, 2],
+            'travel_distance': travel_distance
+        }
+        self._objects_df = None
         return self.objects_df
     
+    def _trajectory_layout(self) -> Tuple[np.ndarray, ...]:
+        """
+        Per-object inputs of the trajectory fill.
+        
+        Returns:
+            Tuple of (lo, need_start, need_stop, counts, start_percent,
+            stop_percent, start_pos, end_pos), one entry (or row) per object
+        """
+        objects = self._objects
+        time_points = self._time_points
+        num_times = len(time_points)
+        
+        # Look up each object's group active time window
+        obj_group = self._group_rows(objects['group_id'])
+        start_percent = self.groups_df['start_percent'].to_numpy(dtype=float)[obj_group]
+        stop_percent = self.groups_df['stop_percent'].to_numpy(dtype=float)[obj_group]
+        
+        # Time points inside each object's window are time_points[lo:hi]
+        lo = np.searchsorted(time_points, start_percent, side='left')
+        hi = np.searchsorted(time_points, stop_percent, side='right')
+        num_inside = hi - lo
+        
+        # Ensure we have exact start and stop times
+        need_start = ~((lo < num_times) &
+                       (time_points[np.minimum(lo, num_times - 1)] == start_percent))
+        need_stop = ~((num_inside > 0) &
+                      (time_points[np.maximum(hi - 1, 0)] == stop_percent))
+        counts = num_inside + need_start + need_stop
+        
+        if self._positions is None:
+            # Objects were assigned as a DataFrame: gather the columns once
+            self._positions = (
+                np.column_stack([objects['start_north'], objects['start_east'], objects['start_down']]),
+                np.column_stack([objects['end_north'], objects['end_east'], objects['end_down']])
+            )
+        start_pos, end_pos = self._positions
+        
+        return lo, need_start, need_stop, counts, start_percent, stop_percent, start_pos, end_pos
+    
+    def _trajectory_columns(self, layout: Tuple[np.ndarray, ...],
+                            rows: slice = slice(None)) -> Dict[str, np.ndarray]:
+        """
+        Trajectory column arrays for a contiguous range of objects.
+        
+        Args:
+            layout: Result of _trajectory_layout()
+            rows: Objects to include (default: all)
+            
+        Returns:
+            Mapping of trajectory column name to array
+        """
+        lo, need_start, need_stop, counts, start_percent, stop_percent, start_pos, end_pos = (
+            a[rows] for a in layout
+        )
+        
+        # Fused, multi-core kernel only pays off once compile/dispatch is amortized
+        fill = (_fill_trajectories_numba if NUMBA_AVAILABLE and counts.sum() >= NUMBA_MIN_ROWS
+                else _fill_trajectories_numpy)
+        _, t, pos = fill(self._time_points, lo, need_start, need_stop, counts,
+                         start_percent, stop_percent, start_pos, end_pos)
+        
+        # Rows are laid out object by object, so per-object columns expand
+        # with np.repeat rather than a gather through obj
+        return {
+            'object_id': np.repeat(self._objects['object_id'][rows], counts),
+            'group_id': np.repeat(self._objects['group_id'][rows], counts),
+            'category': np.repeat(self._objects['category'][rows], counts),
+            'time_percent': t,
+            'north': pos[:, 0],
+            'east': pos[:, 1],
+            'down': pos[:, 2]
+        }
+    
     def generate_trajectories(self) -> pd.DataFrame:
         """
         Generate complete trajectories for all objects over time.
@@ -182,62 +520,67 @@ class SpatialGroupSimulator:
         Returns:
             DataFrame with object positions at each time point
         """
-        if self.objects_df is None:
+        if self._objects is None:
             raise ValueError("Must call generate_objects() first")
         
-        # Generate time points (0 to 100 percent)
-        time_points = np.linspace(0, 100, self.num_time_points)
+        self._trajectory = self._trajectory_columns(self._trajectory_layout())
+        self._trajectory_df = None
+        return self.trajectory_df
+    
+    def save_trajectories_csv(self, path: Path, chunk_rows: Optional[int] = None) -> Path:
+        """
+        Compute and write trajectories to CSV block by block.
         
-        trajectory_list = []
+        Unlike generate_trajectories(), the full trajectory is never held in
+        memory: objects are processed in batches of about chunk_rows rows,
+        each written as soon as it is computed. The output matches
+        save_trajectories() after generate_trajectories().
         
-        for _, obj in self.objects_df.iterrows():
-            object_id = obj['object_id']
-            group_id = obj['group_id']
-            
-            # Get group's active time window
-            group = self.groups_df[self.groups_df['group_id'] == group_id].iloc[0]
-            start_percent = group['start_percent']
-            stop_percent = group['stop_percent']
-            
-            # Filter time points to group's active window
-            # Include exact start and stop times if not already in time_points
-            active_times = time_points[(time_points >= start_percent) & (time_points <= stop_percent)]
-            
-            # Ensure we have exact start and stop times
-            active_times_list = list(active_times)
-            if len(active_times_list) == 0 or active_times_list[0] != start_percent:
-                active_times_list.insert(0, start_percent)
-            if active_times_list[-1] != stop_percent:
-                active_times_list.append(stop_percent)
-            active_times = np.array(active_times_list)
+        Args:
+            path: Output CSV file path
+            chunk_rows: Approximate rows computed per block (default CSV_CHUNK_ROWS)
             
-            # Get start and end positions
-            start_pos = np.array([obj['start_north'], obj['start_east'], obj['start_down']])
-            end_pos = np.array([obj['end_north'], obj['end_east'], obj['end_down']])
+        Returns:
+            The path written
             
-            # Linear interpolation for each time point
-            for t in active_times:
-                # Calculate interpolation factor (0 at start_percent, 1 at stop_percent)
-                if stop_percent == start_percent:
-                    alpha = 0
-                else:
-                    alpha = (t - start_percent) / (stop_percent - start_percent)
-                
-                # Interpolate position
-                pos = start_pos + alpha * (end_pos - start_pos)
-                
-                trajectory_list.append({
-                    'object_id': object_id,
-                    'group_id': group_id,
-                    'category': obj['category'],
-                    'time_percent': t,
-                    'north': pos[0],
-                    'east': pos[1],
-                    'down': pos[2]
-                })
-        
-        self.trajectory_df = pd.DataFrame(trajectory_list)
-        return self.trajectory_df
+        Raises:
+            ValueError: If objects were not generated
+        """
+        if self._objects is None:
+            raise ValueError("Must call generate_objects() first")
+        chunk_rows = chunk_rows or CSV_CHUNK_ROWS
+        
+        layout = self._trajectory_layout()
+        ends = np.cumsum(layout[3])
+        
+        path = Path(path)
+        with open(path, 'w') as f:
+            first = 0
+            while True:
+                # Take whole objects until the block reaches chunk_rows rows
+                done = ends[first - 1] if first else 0
+                last = max(int(np.searchsorted(ends, done + chunk_rows, side='right')), first + 1)
+                _append_csv(f, self._trajectory_columns(layout, slice(first, last)), header=first == 0)
+                first = last
+                if first >= len(ends):
+                    break
+        return path
+    
+    def trajectory_by_object(self) -> Dict[int, pd.DataFrame]:
+        """
+        Split the trajectories into one DataFrame per object.
+        
+        Built with a single groupby pass, so per-object lookups are dict
+        accesses rather than a scan of the full trajectory per object.
+        
+        Returns:
+            Dictionary mapping object_id to that object's trajectory rows
+        """
+        if self._trajectory is None:
+            raise ValueError("Must call generate_trajectories() first")
+        
+        return {int(obj_id): rows for obj_id, rows in
+                self.trajectory_df.groupby('object_id', sort=False)}
     
     def get_summary_statistics(self) -> Dict:
         """
@@ -246,46 +589,97 @@ class SpatialGroupSimulator:
         Returns:
             Dictionary with summary statistics
         """
-        if self.objects_df is None:
+        if self._objects is None:
             raise ValueError("Must call generate_objects() first")
         
+        # Reuse the last result while objects/trajectories are unchanged
+        if self._stats_cache is not None:
+            cached_objects, cached_trajectories, cached_stats = self._stats_cache
+            if cached_objects is self._objects and cached_trajectories is self._trajectory:
+                return copy.deepcopy(cached_stats)
+        
+        group_ids, group_counts = np.unique(self._objects['group_id'], return_counts=True)
+        categories = self._objects['category']
+        travel = self._objects['travel_distance']
+        
         stats = {
             'total_groups': len(self.groups_df),
-            'total_objects': len(self.objects_df),
+            'total_objects': len(travel),
             'num_time_points': self.num_time_points,
-            'objects_per_group': self.objects_df.groupby('group_id').size().to_dict(),
+            'objects_per_group': {int(g): int(n) for g, n in zip(group_ids, group_counts)},
             'categories': {
-                'category_1': len(self.objects_df[self.objects_df['category'] == 1]),
-                'category_2': len(self.objects_df[self.objects_df['category'] == 2]),
-                'category_3': len(self.objects_df[self.objects_df['category'] == 3])
+                f'category_{k}': int(np.count_nonzero(categories == k)) for k in (1, 2, 3)
             },
             'travel_distance_stats': {
-                'min': float(self.objects_df['travel_distance'].min()),
-                'max': float(self.objects_df['travel_distance'].max()),
-                'mean': float(self.objects_df['travel_distance'].mean()),
-                'std': float(self.objects_df['travel_distance'].std())
+                'min': float(travel.min()),
+                'max': float(travel.max()),
+                'mean': float(travel.mean()),
+                'std': float(travel.std(ddof=1)) if len(travel) > 1 else float('nan')
             }
         }
         
-        if self.trajectory_df is not None:
-            stats['total_trajectory_points'] = len(self.trajectory_df)
+        if self._trajectory is not None:
+            stats['total_trajectory_points'] = len(self._trajectory['object_id'])
+        
+        self._stats_cache = (self._objects, self._trajectory, stats)
+        return copy.deepcopy(stats)
+    
+    def save_trajectories(self, path: Path) -> Path:
+        """
+        Save trajectories alone, in the format given by the file suffix.
+        
+        Columns are written straight from the trajectory arrays: '.parquet'
+        files go through pyarrow, anything else is streamed as CSV.
         
-        return stats
+        Args:
+            path: Output file path
+            
+        Returns:
+            The path written
+            
+        Raises:
+            ValueError: If trajectories were not generated
+            ImportError: If a .parquet path is given without pyarrow
+        """
+        if self._trajectory is None:
+            raise ValueError("Must call generate_trajectories() first")
+        
+        path = Path(path)
+        if path.suffix == '.parquet':
+            if not PYARROW_AVAILABLE:
+                raise ImportError("pyarrow is required for parquet output")
+            _write_parquet(path, self._trajectory)
+        else:
+            _write_csv(path, self._trajectory)
+        return path
     
-    def save_outputs(self, output_dir: Path, prefix: Optional[str] = None) -> Dict[str, Path]:
+    def save_outputs(self, output_dir: Path, prefix: Optional[str] = None,
+                     file_format: str = 'csv') -> Dict[str, Path]:
         """
-        Save simulation outputs to CSV files.
+        Save simulation outputs to CSV or Parquet files.
         
         Args:
             output_dir: Directory to save outputs
             prefix: Optional prefix for filenames (default: timestamp)
+            file_format: 'csv' (default) or 'parquet' (requires pyarrow)
             
         Returns:
             Dictionary mapping output type to file path
+            
+        Raises:
+            ValueError: If objects were not generated or the format is unknown
+            ImportError: If parquet output is requested without pyarrow
         """
-        if self.objects_df is None:
+        if self._objects is None:
             raise ValueError("Must call generate_objects() first")
         
+        writers = {'csv': _write_csv, 'parquet': _write_parquet}
+        if file_format not in writers:
+            raise ValueError(f"file_format must be one of {sorted(writers)}, got {file_format!r}")
+        if file_format == 'parquet' and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for parquet output")
+        write = writers[file_format]
+        
         # Create output directory if needed
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -298,29 +692,29 @@ class SpatialGroupSimulator:
         files = {}
         
         # Save input groups
-        groups_file = output_dir / f"{prefix}_input_groups.csv"
-        self.groups_df.to_csv(groups_file, index=False)
+        groups_file = output_dir / f"{prefix}_input_groups.{file_format}"
+        if file_format == 'csv':
+            self.groups_df.to_csv(groups_file, index=False)
+        else:
+            write(groups_file, {col: self.groups_df[col].to_numpy() for col in self.groups_df.columns})
         files['input_groups'] = groups_file
         
         # Save objects
-        objects_file = output_dir / f"{prefix}_objects.csv"
-        self.objects_df.to_csv(objects_file, index=False)
+        objects_file = output_dir / f"{prefix}_objects.{file_format}"
+        write(objects_file, self._objects)
         files['objects'] = objects_file
         
         # Save trajectories if generated
-        if self.trajectory_df is not None:
-            trajectories_file = output_dir / f"{prefix}_trajectories.csv"
-            self.trajectory_df.to_csv(trajectories_file, index=False)
+        if self._trajectory is not None:
+            trajectories_file = output_dir / f"{prefix}_trajectories.{file_format}"
+            write(trajectories_file, self._trajectory)
             files['trajectories'] = trajectories_file
         
         # Save summary statistics
-        summary_file = output_dir / f"{prefix}_summary.txt"
+        summary_file = output_dir / f"{prefix}_summary.json"
         stats = self.get_summary_statistics()
         with open(summary_file, 'w') as f:
-            f.write("Spatial Group Simulation Summary\n")
-            f.write("=" * 60 + "\n\n")
-            for key, value in stats.items():
-                f.write(f"{key}: {value}\n")
+            f.write(json.dumps(stats, indent=2, default=_json_default))
         files['summary'] = summary_file
         
         return files
@@ -13,11 +13,12 @@ Usage:
 
 import sys
 import argparse
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from group_scheduler import GroupScheduler, ValidationError
 from group_timeline import GroupTimeline
 
@@ -32,60 +33,62 @@ def print_separator(title: str = ""):
         print(f"{'='*70}\n")
 
 
-def create_example_scenarios() -> Dict[str, pd.DataFrame]:
-    """Create several example scenarios showing different overlap patterns."""
-    
-    scenarios = {}
-    
+# Example scenarios as (name, rows) with columns SCENARIO_COLUMNS; kept as
+# int arrays so each DataFrame is built from one block with no inference
+SCENARIO_COLUMNS = ['group_id', 'group_size', 'start_percent', 'stop_percent']
+
+_SCENARIOS_RAW = (
     # Scenario 1: No overlaps - groups in sequence
-    scenarios['No Overlaps (Sequential)'] = pd.DataFrame({
-        'group_id': [1, 2, 3],
-        'group_size': [10, 15, 8],
-        'start_percent': [0, 35, 70],
-        'stop_percent': [30, 65, 100]
-    })
+    ('No Overlaps (Sequential)', np.array([
+        [1, 10, 0, 30],
+        [2, 15, 35, 65],
+        [3, 8, 70, 100],
+    ], dtype=np.int64)),
     
     # Scenario 2: Two groups overlapping
-    scenarios['Two Groups Overlap'] = pd.DataFrame({
-        'group_id': [1, 2],
-        'group_size': [20, 15],
-        'start_percent': [0, 40],
-        'stop_percent': [60, 100]
-    })
+    ('Two Groups Overlap', np.array([
+        [1, 20, 0, 60],
+        [2, 15, 40, 100],
+    ], dtype=np.int64)),
     
     # Scenario 3: All groups overlapping in middle
-    scenarios['Three Groups Overlap'] = pd.DataFrame({
-        'group_id': [1, 2, 3],
-        'group_size': [10, 15, 12],
-        'start_percent': [0, 20, 40],
-        'stop_percent': [60, 80, 100]
-    })
+    ('Three Groups Overlap', np.array([
+        [1, 10, 0, 60],
+        [2, 15, 20, 80],
+        [3, 12, 40, 100],
+    ], dtype=np.int64)),
     
     # Scenario 4: Four groups with various overlaps
-    scenarios['Four Groups - Complex'] = pd.DataFrame({
-        'group_id': [1, 2, 3, 4],
-        'group_size': [10, 15, 8, 12],
-        'start_percent': [0, 15, 40, 65],
-        'stop_percent': [50, 70, 85, 100]
-    })
+    ('Four Groups - Complex', np.array([
+        [1, 10, 0, 50],
+        [2, 15, 15, 70],
+        [3, 8, 40, 85],
+        [4, 12, 65, 100],
+    ], dtype=np.int64)),
     
     # Scenario 5: Gaps with no activity
-    scenarios['With Gaps (No Activity)'] = pd.DataFrame({
-        'group_id': [1, 2, 3],
-        'group_size': [10, 15, 8],
-        'start_percent': [0, 40, 75],
-        'stop_percent': [25, 60, 100]
-    })
+    ('With Gaps (No Activity)', np.array([
+        [1, 10, 0, 25],
+        [2, 15, 40, 60],
+        [3, 8, 75, 100],
+    ], dtype=np.int64)),
     
     # Scenario 6: Maximum overlap - all groups active together
-    scenarios['Maximum Overlap'] = pd.DataFrame({
-        'group_id': [1, 2, 3, 4],
-        'group_size': [10, 15, 8, 12],
-        'start_percent': [0, 10, 20, 30],
-        'stop_percent': [70, 80, 90, 100]
-    })
-    
-    return scenarios
+    ('Maximum Overlap', np.array([
+        [1, 10, 0, 70],
+        [2, 15, 10, 80],
+        [3, 8, 20, 90],
+        [4, 12, 30, 100],
+    ], dtype=np.int64)),
+)
+
+
+def create_example_scenarios() -> Dict[str, pd.DataFrame]:
+    """Create several example scenarios showing different overlap patterns."""
+    return {
+        name: pd.DataFrame(rows, columns=SCENARIO_COLUMNS)
+        for name, rows in _SCENARIOS_RAW
+    }
 
 
 def print_overlap_analysis(overlaps: List[Tuple[int, int]], data: pd.DataFrame):
@@ -94,15 +97,22 @@ def print_overlap_analysis(overlaps: List[Tuple[int, int]], data: pd.DataFrame):
         print("  ➤ No overlapping groups")
         return
     
+    # Index groups once, then compute every pair's overlap period together
+    group_ids = np.asarray(data['group_id'])
+    starts = np.asarray(data['start_percent'], dtype=float)
+    stops = np.asarray(data['stop_percent'], dtype=float)
+    
+    row_of = {}
+    for i, gid in enumerate(group_ids.tolist()):
+        row_of.setdefault(gid, i)  # First row wins, as with .iloc[0]
+    i1 = np.array([row_of[g1] for g1, _ in overlaps])
+    i2 = np.array([row_of[g2] for _, g2 in overlaps])
+    
+    overlap_starts = np.maximum(starts[i1], starts[i2])
+    overlap_ends = np.minimum(stops[i1], stops[i2])
+    
     print("  ➤ Overlapping Group Pairs:")
-    for g1, g2 in overlaps:
-        # Get the actual overlap period
-        row1 = data[data['group_id'] == g1].iloc[0]
-        row2 = data[data['group_id'] == g2].iloc[0]
-        
-        overlap_start = max(row1['start_percent'], row2['start_percent'])
-        overlap_end = min(row1['stop_percent'], row2['stop_percent'])
-        
+    for (g1, g2), overlap_start, overlap_end in zip(overlaps, overlap_starts, overlap_ends):
         print(f"     - Groups {g1} and {g2}: overlap from {overlap_start:.1f}% to {overlap_end:.1f}%")
 
 
@@ -116,39 +126,69 @@ def print_concurrent_analysis(stats: Dict[str, Any], matrix: np.ndarray,
     print(f"     - Time points with zero activity: {stats['times_with_zero']}")
     print(f"     - Time points at maximum: {stats['times_with_max']}")
     
-    # Find times with different concurrency levels
-    concurrent = np.sum(matrix, axis=0)
+    # Find times with different concurrency levels: one stable sort buckets
+    # the time points by level, keeping each bucket in time order
+    concurrent = matrix.sum(axis=0)
+    levels, counts = np.unique(concurrent, return_counts=True)
+    order = np.argsort(concurrent, kind='stable')
+    buckets = np.split(time_points[order], np.cumsum(counts[:-1]))
     
     print("\n  ➤ Activity Patterns:")
-    for level in range(stats['min_concurrent'], stats['max_concurrent'] + 1):
-        count = np.sum(concurrent == level)
-        if count > 0:
-            times = [f"{time_points[i]:.1f}%" for i, c in enumerate(concurrent) if c == level]
-            if len(times) <= 5:
-                times_str = ", ".join(times)
-            else:
-                times_str = ", ".join(times[:3]) + f" ... ({len(times)} total)"
-            print(f"     - {level} groups active: {count} time points (e.g., {times_str})")
+    for level, count, times in zip(levels.tolist(), counts.tolist(), buckets):
+        shown = times if count <= 5 else times[:3]
+        times_str = ", ".join(np.char.mod('%.1f%%', shown))
+        if count > 5:
+            times_str += f" ... ({count} total)"
+        print(f"     - {level} groups active: {count} time points (e.g., {times_str})")
+
+
+# Signatures of group data that already passed validation (LRU bounded)
+VALIDATION_CACHE_SIZE = 64
+_validated: "OrderedDict[tuple, None]" = OrderedDict()
+
+
+def validate_cached(scheduler: GroupScheduler, data: pd.DataFrame):
+    """
+    Validate group data, skipping inputs already known to be valid.
+    
+    The signature is the column names plus every row's hash, so any change
+    to the data forces a fresh validation. Only successful validations are
+    remembered.
+    
+    Raises:
+        ValidationError: If the data is invalid
+    """
+    signature = (tuple(data.columns),
+                 pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    if signature in _validated:
+        _validated.move_to_end(signature)
+        return
+    
+    scheduler.validate_data(data)
+    _validated[signature] = None
+    if len(_validated) > VALIDATION_CACHE_SIZE:
+        _validated.popitem(last=False)
 
 
-def run_scenario(name: str, data: pd.DataFrame, num_points: int = 20):
-    """Run and display one scenario."""
+def run_scenario(name: str, data: pd.DataFrame, num_points: int = 20) -> Optional[Dict[str, Any]]:
+    """Run and display one scenario, returning its report (None if data is invalid)."""
     print_separator(name)
     
     # Validate data
     scheduler = GroupScheduler()
     try:
-        scheduler.validate_data(data)
+        validate_cached(scheduler, data)
     except ValidationError as e:
         print(f"❌ Invalid data: {e}")
-        return
+        return None
     
     # Show group info
     print("Groups:")
-    for _, row in data.iterrows():
-        print(f"  - Group {row['group_id']}: "
-              f"{row['group_size']} people, "
-              f"{row['start_percent']:.0f}%-{row['stop_percent']:.0f}%")
+    rows = data[['group_id', 'group_size', 'start_percent', 'stop_percent']].itertuples(index=False, name=None)
+    print("\n".join(
+        f"  - Group {gid}: {size} people, {start:.0f}%-{stop:.0f}%"
+        for gid, size, start, stop in rows
+    ))
     
     # Generate timeline
     timeline = GroupTimeline()
@@ -169,6 +209,7 @@ def run_scenario(name: str, data: pd.DataFrame, num_points: int = 20):
                              report['time_points'])
     
     print()
+    return report
 
 
 def save_report(name: str, report: Dict[str, Any], output_dir: Path):
@@ -226,7 +267,7 @@ def main():
         print(f"\nLoading data from: {args.csv}")
         scheduler = GroupScheduler()
         try:
-            data = scheduler.load_csv(args.csv)
+            data = scheduler.load_csv(args.csv).to_dataframe()
             run_scenario("Custom Data", data, args.num_points)
         except Exception as e:
             print(f"❌ Error loading CSV: {e}")
@@ -243,11 +284,9 @@ def main():
             output_dir.mkdir(exist_ok=True)
         
         for name, data in scenarios.items():
-            run_scenario(name, data, args.num_points)
+            report = run_scenario(name, data, args.num_points)
             
-            if args.save:
-                timeline = GroupTimeline()
-                report = timeline.generate_report(data, num_points=args.num_points)
+            if args.save and report is not None:
                 filepath = save_report(name, report, output_dir)
                 print(f"  📄 Report saved: {filepath}")
                 print()
@@ -16,7 +16,7 @@ import sys
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from group_scheduler import GroupScheduler, ValidationError
+from group_scheduler import GroupScheduler, GroupData, ValidationError
 
 
 # ============================================================================
@@ -216,6 +216,21 @@ def test_reject_zero_group_size():
         scheduler.validate_data(data)
 
 
+@pytest.mark.unit
+def test_validation_error_reports_first_offending_row():
+    """Error should name the first row that breaks a constraint"""
+    scheduler = GroupScheduler()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 0],
+        'start_percent': [0, 60, 20],
+        'stop_percent': [50, 40, 80]
+    })
+    
+    with pytest.raises(ValidationError, match=r"Start time must be before stop time.*\(row 1\)"):
+        scheduler.validate_data(data)
+
+
 # ============================================================================
 # EDGE CASES
 # ============================================================================
@@ -280,6 +295,92 @@ def test_single_group():
     assert result is True
 
 
+@pytest.mark.unit
+def test_reject_empty_schedule():
+    """A schedule needs at least one group"""
+    scheduler = GroupScheduler()
+    data = pd.DataFrame({
+        'group_id': [],
+        'group_size': [],
+        'start_percent': [],
+        'stop_percent': []
+    })
+    
+    with pytest.raises(ValidationError, match="At least one group"):
+        scheduler.validate_data(data)
+
+
+@pytest.mark.unit
+def test_reject_missing_times():
+    """Missing (NaN) times fail validation instead of passing every check"""
+    scheduler = GroupScheduler()
+    data = pd.DataFrame({
+        'group_id': [1, 2],
+        'group_size': [10, 15],
+        'start_percent': [0, np.nan],
+        'stop_percent': [50, 100]
+    })
+    
+    with pytest.raises(ValidationError, match=r"Start times must be >= 0 \(row 1\)"):
+        scheduler.validate_data(data)
+
+
+@pytest.mark.unit
+def test_load_csv_missing_column(tmp_path):
+    """Should reject CSV files missing a required column"""
+    csv_path = tmp_path / "missing_column.csv"
+    csv_path.write_text("group_id,group_size,start_percent\n1,10,0\n")
+    
+    scheduler = GroupScheduler()
+    with pytest.raises(ValueError, match="Missing required columns"):
+        scheduler.load_csv(str(csv_path))
+
+
+@pytest.mark.unit
+def test_load_csv_float_times(tmp_path):
+    """Fractional times should load as floats"""
+    csv_path = tmp_path / "float_times.csv"
+    csv_path.write_text("group_id,group_size,start_percent,stop_percent\n1,10,0,32.5\n")
+    
+    scheduler = GroupScheduler()
+    data = scheduler.load_csv(str(csv_path))
+    
+    assert data['stop_percent'].dtype == np.float64
+    assert data['stop_percent'][0] == 32.5
+    assert data['group_id'].dtype == np.int64
+
+
+@pytest.mark.unit
+def test_load_csv_blank_cell_fails_validation(tmp_path):
+    """Blank cells should load as NaN and be reported by validation"""
+    csv_path = tmp_path / "blank_cell.csv"
+    csv_path.write_text("group_id,group_size,start_percent,stop_percent\n1,10,0,30\n2,5,,60\n")
+    
+    scheduler = GroupScheduler()
+    data = scheduler.load_csv(str(csv_path))
+    
+    assert np.isnan(data['start_percent'][1])
+    with pytest.raises(ValidationError, match=r"Start times must be >= 0 \(row 1\)"):
+        scheduler.validate_data(data)
+
+
+@pytest.mark.unit
+def test_load_csv_cached_until_file_changes(tmp_path):
+    """Unchanged files are served from the cache; edited files are re-read"""
+    csv_path = tmp_path / "cached.csv"
+    csv_path.write_text("group_id,group_size,start_percent,stop_percent\n1,10,0,30\n")
+    
+    scheduler = GroupScheduler()
+    first = scheduler.load_csv(str(csv_path))
+    second = GroupScheduler().load_csv(str(csv_path))
+    assert second['group_size'] is first['group_size']
+    assert not first['group_size'].flags.writeable
+    
+    csv_path.write_text("group_id,group_size,start_percent,stop_percent\n1,12,0,30\n2,5,10,20\n")
+    third = scheduler.load_csv(str(csv_path))
+    assert third['group_size'].tolist() == [12, 5]
+
+
 # ============================================================================
 # INTEGRATION TESTS
 # ============================================================================
@@ -330,3 +431,43 @@ def test_get_summary_statistics(tmp_path):
     assert summary['earliest_start'] == 0
     assert summary['latest_stop'] == 95
 
+
+@pytest.mark.integration
+def test_group_data_round_trip(tmp_path):
+    """GroupData from load_csv converts to an equivalent DataFrame"""
+    csv_path = tmp_path / "roundtrip_test.csv"
+    test_data = """group_id,group_size,start_percent,stop_percent
+1,10,0,30
+2,15,25,60
+"""
+    csv_path.write_text(test_data)
+    
+    scheduler = GroupScheduler()
+    data = scheduler.load_csv(str(csv_path))
+    
+    assert isinstance(data, GroupData)
+    assert scheduler.validate_data(data) is True
+    pd.testing.assert_frame_equal(data.to_dataframe(), pd.read_csv(csv_path))
+    
+    frame = pd.read_csv(csv_path)
+    assert scheduler.get_summary(data) == scheduler.get_summary(frame)
+
+
+@pytest.mark.integration
+def test_main_total_time_with_group_data(tmp_path):
+    """The --total-time report should work on GroupData loaded by the CLI"""
+    import subprocess
+    
+    csv_path = tmp_path / "total_time_test.csv"
+    csv_path.write_text("group_id,group_size,start_percent,stop_percent\n1,10,0,30\n2,15,25,60\n")
+    main_path = Path(__file__).parent.parent / 'src' / 'main.py'
+    
+    result = subprocess.run(
+        [sys.executable, str(main_path), str(csv_path), '--total-time', '120',
+         '--output-dir', str(tmp_path / 'results')],
+        capture_output=True, text=True
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert "Group 1: 0.0 - 36.0 min (duration: 36.0 min, 10 people)" in result.stdout
+    assert "Group 2: 30.0 - 72.0 min (duration: 42.0 min, 15 people)" in result.stdout
@@ -41,6 +41,7 @@ def test_timeline_values_binary():
     matrix, time_points = timeline.generate_timeline(data, num_points=10)
     unique_values = np.unique(matrix)
     assert all(v in [0, 1] for v in unique_values), "Timeline must contain only 0 and 1"
+    assert matrix.dtype == np.uint8
 
 
 @pytest.mark.invariant
@@ -87,6 +88,93 @@ def test_group_active_within_bounds():
         assert matrix[0, idx] == 0, f"Group should be inactive after stop at time {time_points[idx]}"
 
 
+@pytest.mark.invariant
+def test_timeline_matches_is_active():
+    """Every matrix cell must agree with TimelineGenerator.is_active"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 25, 60],
+        'stop_percent': [30, 60, 95]
+    })
+    
+    matrix, time_points = timeline.generate_timeline(data, num_points=21)
+    
+    for i, (start, stop) in enumerate(zip(data['start_percent'], data['stop_percent'])):
+        for j, t in enumerate(time_points):
+            assert matrix[i, j] == TimelineGenerator.is_active(t, start, stop)
+
+
+@pytest.mark.invariant
+def test_numba_timeline_matches_numpy(monkeypatch):
+    """The compiled timeline kernel fills the same matrix as the broadcast"""
+    pytest.importorskip('numba')
+    import group_timeline
+    
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 20, 60.5],
+        'stop_percent': [50, 70, 100]
+    })
+    
+    monkeypatch.setattr(group_timeline, 'NUMBA_MIN_CELLS', float('inf'))
+    expected, _ = timeline.generate_timeline(data, num_points=37)
+    monkeypatch.setattr(group_timeline, 'NUMBA_MIN_CELLS', 0)
+    matrix, _ = GroupTimeline().generate_timeline(data, num_points=37)
+    
+    assert matrix.dtype == np.uint8
+    np.testing.assert_array_equal(matrix, expected)
+
+
+@pytest.mark.invariant
+def test_slice_fill_timeline_matches_broadcast(monkeypatch):
+    """Filling active runs by slice gives the same matrix as comparing every cell"""
+    import group_timeline
+    monkeypatch.setattr(group_timeline, 'NUMBA_MIN_CELLS', float('inf'))
+    
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3, 4],
+        'group_size': [10, 15, 8, 12],
+        'start_percent': [0, 20, 60.5, 30],
+        'stop_percent': [50, 70, 100, 30]
+    })
+    
+    monkeypatch.setattr(group_timeline, 'SLICE_FILL_MIN_POINTS', float('inf'))
+    expected, _ = GroupTimeline().generate_timeline(data, num_points=101)
+    monkeypatch.setattr(group_timeline, 'SLICE_FILL_MIN_POINTS', 0)
+    matrix, _ = GroupTimeline().generate_timeline(data, num_points=101)
+    
+    assert matrix.dtype == np.uint8
+    np.testing.assert_array_equal(matrix, expected)
+
+
+@pytest.mark.invariant
+@pytest.mark.parametrize('num_points', [1, 20, 64, 65, 130])
+def test_timeline_bits_match_matrix(num_points):
+    """Packed timeline bits unpack to the uint8 matrix and its column sums"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 20, 60],
+        'stop_percent': [50, 70, 100]
+    })
+    
+    matrix, _ = timeline.generate_timeline(data, num_points=num_points)
+    bits, _ = timeline.generate_timeline_bits(data, num_points=num_points)
+    
+    assert bits.dtype == np.uint64
+    assert bits.shape == (3, -(-num_points // 64))
+    for j in range(num_points):
+        np.testing.assert_array_equal((bits[:, j // 64] >> np.uint64(j % 64)) & np.uint64(1), matrix[:, j])
+    np.testing.assert_array_equal(
+        GroupTimeline.concurrent_counts_from_bits(bits, num_points), matrix.sum(axis=0)
+    )
+
+
 # ============================================================================
 # GOLDEN TESTS - Known scenarios with expected outputs
 # ============================================================================
@@ -239,6 +327,28 @@ def test_concurrent_statistics():
     assert stats['min_concurrent'] >= 0
 
 
+@pytest.mark.unit
+def test_concurrent_stats_reused_only_for_cached_matrices():
+    """Stats of generated matrices are reused; caller-owned matrices are recomputed"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 25, 50],
+        'stop_percent': [50, 75, 100]
+    })
+    
+    matrix, _ = timeline.generate_timeline(data, num_points=20)
+    first = timeline.get_concurrent_stats(matrix)
+    first['max_concurrent'] = -1
+    assert timeline.get_concurrent_stats(matrix)['max_concurrent'] == 2
+    
+    own = matrix.copy()
+    assert timeline.get_concurrent_stats(own)['max_concurrent'] == 2
+    own[:, 0] = 1
+    assert timeline.get_concurrent_stats(own)['max_concurrent'] == 3
+
+
 @pytest.mark.unit
 def test_get_active_groups_at_time():
     """Test getting list of active groups at specific time."""
@@ -263,6 +373,67 @@ def test_get_active_groups_at_time():
     assert 3 in active
 
 
+@pytest.mark.unit
+def test_get_active_groups_at_times_matches_single_queries():
+    """Batch query returns the same lists as one query per time."""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 20, 60],
+        'stop_percent': [50, 70, 100]
+    })
+    
+    times = [0, 20, 30, 50, 65, 100]
+    expected = [timeline.get_active_groups_at_time(data, t) for t in times]
+    assert timeline.get_active_groups_at_times(data, times) == expected
+
+
+@pytest.mark.golden
+def test_exact_concurrent_stats():
+    """Exact stats come from the step profile, not from sampled time points.
+    
+    Scenario: Group 1: 0-25%, Group 2: 40-60%, Group 3: 75-100%
+    Expected: 30% of the time idle, time-weighted average 0.7
+    """
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3],
+        'group_size': [10, 15, 8],
+        'start_percent': [0, 40, 75],
+        'stop_percent': [25, 60, 100]
+    })
+    
+    edges, counts = timeline.concurrent_profile(data)
+    assert edges.tolist() == [0, 25, 40, 60, 75, 100]
+    assert counts.tolist() == [1, 0, 1, 0, 1]
+    
+    stats = timeline.get_exact_concurrent_stats(data)
+    assert stats['max_concurrent'] == 1
+    assert stats['min_concurrent'] == 0
+    assert stats['avg_concurrent'] == pytest.approx(0.7)
+    assert stats['time_with_zero'] == pytest.approx(30.0)
+
+
+@pytest.mark.invariant
+def test_exact_max_matches_dense_timeline():
+    """Exact maximum must agree with a timeline sampled at every endpoint"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2, 3, 4],
+        'group_size': [10, 15, 8, 12],
+        'start_percent': [0, 15, 40, 65],
+        'stop_percent': [50, 70, 85, 100]
+    })
+    
+    # 101 points sample every integer percent, which includes every endpoint
+    matrix, _ = timeline.generate_timeline(data, num_points=101)
+    sampled = timeline.get_concurrent_stats(matrix)
+    exact = timeline.get_exact_concurrent_stats(data)
+    
+    assert exact['max_concurrent'] == sampled['max_concurrent']
+
+
 # ============================================================================
 # DISPLAY/FORMATTING TESTS
 # ============================================================================
@@ -312,10 +483,99 @@ def test_generate_complete_report():
     assert isinstance(report['concurrent_stats'], dict)
 
 
+@pytest.mark.unit
+def test_report_cached_for_same_data():
+    """Repeated reports for the same data reuse the cached result"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2],
+        'group_size': [10, 15],
+        'start_percent': [0, 40],
+        'stop_percent': [60, 100]
+    })
+    
+    first = timeline.generate_report(data, num_points=10)
+    second = timeline.generate_report(data.copy(), num_points=10)
+    assert first['timeline_matrix'] is second['timeline_matrix']
+    assert not first['timeline_matrix'].flags.writeable
+    
+    # Mutating a returned report must not leak into the cache
+    first['overlapping_groups'].clear()
+    assert timeline.generate_report(data, num_points=10)['overlapping_groups'] == [(1, 2)]
+    
+    # Different resolution is a different report
+    other = timeline.generate_report(data, num_points=20)
+    assert other['timeline_matrix'].shape == (2, 20)
+
+
+@pytest.mark.unit
+def test_timeline_matrix_cached_on_times():
+    """Timelines with the same windows share one read-only matrix"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2],
+        'group_size': [10, 15],
+        'start_percent': [0, 40],
+        'stop_percent': [60, 100]
+    })
+    
+    matrix, _ = timeline.generate_timeline(data, num_points=10)
+    renamed, _ = timeline.generate_timeline(data.assign(group_id=[7, 8]), num_points=10)
+    assert renamed is matrix
+    assert not matrix.flags.writeable
+    
+    moved, _ = timeline.generate_timeline(data.assign(stop_percent=[30, 100]), num_points=10)
+    assert moved is not matrix
+    assert moved[0].tolist() == [1, 1, 1, 0, 0, 0, 0, 0, 0, 0]
+
+
+@pytest.mark.unit
+def test_report_parts_skip_unrequested_work(monkeypatch):
+    """Only requested report parts are built; the rest are added on demand"""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [1, 2],
+        'group_size': [10, 15],
+        'start_percent': [0, 40],
+        'stop_percent': [60, 100]
+    })
+    
+    calls = []
+    original = timeline.format_as_table
+    monkeypatch.setattr(timeline, 'format_as_table', lambda *args: calls.append(1) or original(*args))
+    
+    partial = timeline.generate_report(data, num_points=10, parts=['concurrent_stats'])
+    assert set(partial) == {'concurrent_stats'}
+    assert calls == []
+    
+    full = timeline.generate_report(data, num_points=10)
+    assert set(full) == set(GroupTimeline.REPORT_PARTS)
+    assert full['concurrent_stats'] == partial['concurrent_stats']
+    assert calls == [1]
+    
+    with pytest.raises(ValueError, match="Unknown report parts"):
+        timeline.generate_report(data, parts=['bogus'])
+
+
 # ============================================================================
 # EDGE CASES
 # ============================================================================
 
+@pytest.mark.unit
+def test_overlaps_exclude_touching_groups():
+    """Groups that only meet at an endpoint do not overlap; pairs follow row order."""
+    timeline = GroupTimeline()
+    data = pd.DataFrame({
+        'group_id': [7, 3, 5, 9],
+        'group_size': [10, 15, 8, 12],
+        'start_percent': [50, 0, 40, 50],
+        'stop_percent': [100, 50, 60, 50]
+    })
+    
+    overlaps = timeline.get_overlapping_groups(data)
+    assert overlaps == [(7, 5), (3, 5), (5, 9)]
+
+
 @pytest.mark.unit
 def test_single_group_no_overlaps():
     """Test single group produces no overlaps."""
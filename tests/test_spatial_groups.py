@@ -9,6 +9,7 @@ Tests cover:
 - Output format validation
 """
 
+import json
 import pytest
 import pandas as pd
 import numpy as np
@@ -44,6 +45,18 @@ class TestSpatialGroupInputValidation:
         assert simulator is not None
         assert len(simulator.groups_df) == 3
     
+    def test_groups_df_is_shared_and_not_modified(self, sample_spatial_groups_df):
+        """The simulator should reference the input groups without altering them."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        original = sample_spatial_groups_df.copy()
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        simulator.generate_objects()
+        simulator.generate_trajectories()
+        
+        assert simulator.groups_df is sample_spatial_groups_df
+        pd.testing.assert_frame_equal(sample_spatial_groups_df, original)
+    
     def test_reject_invalid_category_values(self, sample_spatial_groups_df):
         """Categories must be 1, 2, or 3."""
         from src.spatial_groups import SpatialGroupSimulator
@@ -54,6 +67,16 @@ class TestSpatialGroupInputValidation:
         with pytest.raises(ValueError, match="Category must be 1, 2, or 3"):
             SpatialGroupSimulator(invalid_df, num_time_points=10)
     
+    def test_reject_group_id_outside_int32(self, sample_spatial_groups_df):
+        """Group ids that would wrap in the int32 object columns should be rejected."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        invalid_df = sample_spatial_groups_df.copy()
+        invalid_df.loc[1, 'group_id'] = 2**31
+        
+        with pytest.raises(ValueError, match=r"group_id must fit in 32 bits \(row 1\)"):
+            SpatialGroupSimulator(invalid_df, num_time_points=10)
+    
     def test_reject_negative_spread_std(self, sample_spatial_groups_df):
         """Standard deviation for spread must be positive."""
         from src.spatial_groups import SpatialGroupSimulator
@@ -121,6 +144,10 @@ class TestObjectGeneration:
         for _, group in sample_spatial_groups_df.iterrows():
             group_objects = objects_df[objects_df['group_id'] == group['group_id']]
             assert (group_objects['category'] == group['category']).all()
+        
+        # Categories 1-3 are stored narrowed, in objects and trajectories alike
+        assert objects_df['category'].dtype == np.int8
+        assert simulator.generate_trajectories()['category'].dtype == np.int8
     
     def test_starting_positions_near_center(self, sample_spatial_groups_df):
         """Starting positions should be near group center (within 3 std devs)."""
@@ -210,6 +237,137 @@ class TestTrajectoryGeneration:
             assert np.isclose(last_pos['north'], obj['end_north'], atol=0.01)
             assert np.isclose(last_pos['east'], obj['end_east'], atol=0.01)
             assert np.isclose(last_pos['down'], obj['end_down'], atol=0.01)
+    
+    def test_trajectory_by_object_partitions_rows(self, sample_spatial_groups_df):
+        """Per-object trajectories should cover every trajectory row exactly once."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=20, random_seed=42)
+        objects_df = simulator.generate_objects()
+        
+        with pytest.raises(ValueError, match="generate_trajectories"):
+            simulator.trajectory_by_object()
+        
+        trajectory_df = simulator.generate_trajectories()
+        by_object = simulator.trajectory_by_object()
+        
+        assert sorted(by_object) == objects_df['object_id'].tolist()
+        pd.testing.assert_frame_equal(pd.concat(by_object.values()), trajectory_df)
+        assert (by_object[5]['object_id'] == 5).all()
+    
+    def test_trajectory_by_object_matches_filtered_rows(self, sample_spatial_groups_df):
+        """Each object's trajectory should equal its rows filtered from the full frame."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=20, random_seed=42)
+        objects_df = simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        by_object = simulator.trajectory_by_object()
+        
+        for object_id in objects_df['object_id']:
+            expected = trajectory_df[trajectory_df['object_id'] == object_id]
+            pd.testing.assert_frame_equal(by_object[object_id], expected)
+    
+    def test_off_grid_windows_include_exact_start_and_stop(self, sample_spatial_groups_df):
+        """Windows between time points should gain exact start/stop samples in order."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        groups_df = sample_spatial_groups_df.copy()
+        groups_df['start_percent'] = [12.5, 30.0, 10.1]
+        groups_df['stop_percent'] = [47.3, 70.0, 10.2]
+        
+        simulator = SpatialGroupSimulator(groups_df, num_time_points=11, random_seed=42)
+        simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        
+        for gid, expected in [(1, [12.5, 20, 30, 40, 47.3]),
+                              (2, [30, 40, 50, 60, 70]),
+                              (3, [10.1, 10.2])]:
+            group_traj = trajectory_df[trajectory_df['group_id'] == gid]
+            for _, obj_traj in group_traj.groupby('object_id'):
+                np.testing.assert_allclose(obj_traj['time_percent'].to_numpy(), expected)
+    
+    def test_unsorted_group_ids_use_their_own_windows(self, sample_spatial_groups_df):
+        """Group windows should be looked up by id, not by row order."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        groups_df = sample_spatial_groups_df.copy()
+        groups_df['group_id'] = [30, 10, 20]
+        
+        simulator = SpatialGroupSimulator(groups_df, num_time_points=11, random_seed=42)
+        simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        
+        windows = trajectory_df.groupby('group_id')['time_percent'].agg(['min', 'max'])
+        assert windows.loc[30].tolist() == [0, 40]
+        assert windows.loc[10].tolist() == [30, 70]
+        assert windows.loc[20].tolist() == [60, 100]
+    
+    def test_group_windows_follow_groups_df_changes(self, sample_spatial_groups_df):
+        """Windows should come from the current groups_df, edited or reassigned."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        groups_df = sample_spatial_groups_df.copy()
+        simulator = SpatialGroupSimulator(groups_df, num_time_points=11, random_seed=42)
+        simulator.generate_objects()
+        
+        groups_df.loc[0, 'stop_percent'] = 20
+        windows = simulator.generate_trajectories().groupby('group_id')['time_percent'].agg(['min', 'max'])
+        assert windows.loc[1].tolist() == [0, 20]
+        
+        reassigned = sample_spatial_groups_df.copy()
+        reassigned['group_id'] = [3, 2, 1]
+        simulator.groups_df = reassigned
+        windows = simulator.generate_trajectories().groupby('group_id')['time_percent'].agg(['min', 'max'])
+        assert windows.loc[1].tolist() == [60, 100]
+        assert windows.loc[3].tolist() == [0, 40]
+    
+    def test_unknown_group_id_rejected(self, sample_spatial_groups_df):
+        """Objects referencing a missing group should fail trajectory generation."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        objects_df = simulator.generate_objects().copy()
+        objects_df.loc[0, 'group_id'] = 99
+        simulator.objects_df = objects_df
+        
+        with pytest.raises(ValueError, match="Unknown group_id: 99"):
+            simulator.generate_trajectories()
+    
+    def test_assigned_objects_replace_cached_positions(self, sample_spatial_groups_df):
+        """Trajectories should follow objects assigned after generate_objects()."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        objects_df = simulator.generate_objects().copy()
+        objects_df[['start_north', 'end_north']] += 1000.0
+        simulator.objects_df = objects_df
+        trajectory_df = simulator.generate_trajectories()
+        
+        first = trajectory_df.groupby('object_id')['north'].first()
+        np.testing.assert_allclose(first.to_numpy(), objects_df['start_north'].to_numpy(), rtol=1e-6)
+
+
+class TestTrajectoryKernels:
+    """Test that the optional Numba kernel matches the NumPy implementation."""
+    
+    def test_numba_kernel_matches_numpy(self, sample_spatial_groups_df, monkeypatch):
+        """Both trajectory paths should produce identical output."""
+        pytest.importorskip('numba')
+        from src import spatial_groups
+        
+        sim = spatial_groups.SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=37, random_seed=42)
+        sim.generate_objects()
+        
+        monkeypatch.setattr(spatial_groups, 'NUMBA_MIN_ROWS', float('inf'))
+        numpy_traj = sim.generate_trajectories()
+        
+        monkeypatch.setattr(spatial_groups, 'NUMBA_MIN_ROWS', 0)
+        numba_traj = sim.generate_trajectories()
+        
+        pd.testing.assert_frame_equal(numpy_traj, numba_traj)
+        assert numba_traj['time_percent'].dtype == np.float64
+        assert (numba_traj[['north', 'east', 'down']].dtypes == np.float32).all()
 
 
 class TestStatisticalProperties:
@@ -232,6 +390,47 @@ class TestStatisticalProperties:
             # Check all within reasonable bounds (mean ± 3*std)
             assert (group_objects['travel_distance'] >= mean_dist - 3*std_dist).all()
             assert (group_objects['travel_distance'] <= mean_dist + 3*std_dist).all()
+    
+    def test_samples_truncated_at_three_sigma(self, sample_spatial_groups_df):
+        """Bounds hold for every object, not just for a lucky seed."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        groups_df = sample_spatial_groups_df.assign(group_size=5000)
+        simulator = SpatialGroupSimulator(groups_df, num_time_points=10, random_seed=0)
+        objects_df = simulator.generate_objects()
+        groups = groups_df.set_index('group_id').loc[objects_df['group_id']]
+        
+        offsets = objects_df[['start_north', 'start_east', 'start_down']].to_numpy() - \
+            groups[['center_north', 'center_east', 'center_down']].to_numpy()
+        assert (np.linalg.norm(offsets, axis=1) <= 3 * groups['spread_std'].to_numpy()).all()
+        
+        travel = objects_df['travel_distance'].to_numpy()
+        assert (np.abs(travel - groups['mean_travel_distance'].to_numpy()) <=
+                3 * groups['travel_std'].to_numpy()).all()
+
+
+class TestSummaryStatistics:
+    """Test summary statistics."""
+    
+    def test_category_counts_and_trajectory_points(self, sample_spatial_groups_df):
+        """Stats should reflect the latest generated objects and trajectories."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        simulator.generate_objects()
+        
+        stats = simulator.get_summary_statistics()
+        assert stats['categories'] == {'category_1': 5, 'category_2': 3, 'category_3': 4}
+        assert 'total_trajectory_points' not in stats
+        
+        # Cached result must be refreshed once trajectories exist
+        trajectory_df = simulator.generate_trajectories()
+        stats = simulator.get_summary_statistics()
+        assert stats['total_trajectory_points'] == len(trajectory_df)
+        
+        # Mutating a returned dict must not affect later calls
+        stats['categories']['category_1'] = 0
+        assert simulator.get_summary_statistics()['categories']['category_1'] == 5
 
 
 class TestOutputFormat:
@@ -267,6 +466,101 @@ class TestOutputFormat:
         assert output_file.exists()
         loaded_df = pd.read_csv(output_file)
         assert len(loaded_df) == len(trajectory_df)
+    
+    def test_save_trajectories_by_suffix(self, sample_spatial_groups_df, tmp_path, monkeypatch):
+        """save_trajectories should write CSV and need pyarrow only for .parquet."""
+        from src import spatial_groups
+        
+        simulator = spatial_groups.SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        simulator.generate_objects()
+        with pytest.raises(ValueError, match="generate_trajectories"):
+            simulator.save_trajectories(tmp_path / "early.csv")
+        trajectory_df = simulator.generate_trajectories()
+        
+        output_file = simulator.save_trajectories(tmp_path / "trajectories.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(output_file), trajectory_df, check_dtype=False, atol=1e-6)
+        
+        monkeypatch.setattr(spatial_groups, 'PYARROW_AVAILABLE', False)
+        with pytest.raises(ImportError, match="pyarrow"):
+            simulator.save_trajectories(tmp_path / "trajectories.parquet")
+    
+    @pytest.mark.parametrize('chunk_rows', [1, 7, 1_000_000])
+    def test_save_trajectories_csv_matches_generated(self, sample_spatial_groups_df, tmp_path, chunk_rows):
+        """Block-wise trajectory CSV should match the file written from generated trajectories."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        simulator.generate_objects()
+        streamed = simulator.save_trajectories_csv(tmp_path / "streamed.csv", chunk_rows=chunk_rows)
+        assert simulator.trajectory_df is None
+        
+        simulator.generate_trajectories()
+        expected = simulator.save_trajectories(tmp_path / "expected.csv")
+        assert streamed.read_text() == expected.read_text()
+    
+    def test_save_outputs_streams_csv(self, sample_spatial_groups_df, tmp_path, monkeypatch):
+        """Streamed CSV output should match the DataFrames across chunk boundaries."""
+        from src import spatial_groups
+        
+        monkeypatch.setattr(spatial_groups, 'CSV_CHUNK_ROWS', 7)
+        simulator = spatial_groups.SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        objects_df = simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        
+        files = simulator.save_outputs(tmp_path, prefix="test")
+        
+        for key, expected in (('objects', objects_df), ('trajectories', trajectory_df)):
+            loaded_df = pd.read_csv(files[key])
+            assert list(loaded_df.columns) == list(expected.columns)
+            pd.testing.assert_frame_equal(loaded_df, expected, check_dtype=False, atol=1e-6)
+        
+        # JSON object keys are strings, so compare against a JSON round-trip
+        with open(files['summary']) as f:
+            assert json.load(f) == json.loads(json.dumps(simulator.get_summary_statistics()))
+    
+    def test_saved_trajectories_start_at_saved_object_starts(self, sample_spatial_groups_df, tmp_path):
+        """Each object's first saved trajectory row should be its saved start, to float32 precision."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=7, random_seed=42)
+        simulator.generate_objects()
+        simulator.generate_trajectories()
+        files = simulator.save_outputs(tmp_path, prefix="test")
+        
+        objects = pd.read_csv(files['objects']).set_index('object_id')
+        first_rows = pd.read_csv(files['trajectories']).groupby('object_id').first()
+        
+        # Exact window bounds and grid times survive the round trip
+        starts = sample_spatial_groups_df.set_index('group_id')['start_percent']
+        assert (first_rows['time_percent'] == starts[objects['group_id']].to_numpy()).all()
+        assert '16.666667' in files['trajectories'].read_text()
+        for axis in ('north', 'east', 'down'):
+            np.testing.assert_allclose(first_rows[axis], objects[f'start_{axis}'], rtol=1e-6, atol=1e-6)
+    
+    def test_save_outputs_rejects_unknown_format(self, sample_spatial_groups_df, tmp_path):
+        """Unknown output formats should be rejected before writing anything."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        simulator.generate_objects()
+        
+        with pytest.raises(ValueError, match="file_format"):
+            simulator.save_outputs(tmp_path, prefix="test", file_format="xlsx")
+        assert not any(tmp_path.iterdir())
+    
+    def test_save_outputs_parquet(self, sample_spatial_groups_df, tmp_path):
+        """Parquet output should round-trip the objects and trajectories."""
+        pytest.importorskip('pyarrow')
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        simulator = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        objects_df = simulator.generate_objects()
+        trajectory_df = simulator.generate_trajectories()
+        
+        files = simulator.save_outputs(tmp_path, prefix="test", file_format="parquet")
+        
+        pd.testing.assert_frame_equal(pd.read_parquet(files['objects']), objects_df)
+        pd.testing.assert_frame_equal(pd.read_parquet(files['trajectories']), trajectory_df)
 
 
 class TestDeterminism:
@@ -302,4 +596,18 @@ class TestDeterminism:
         
         # Starting positions should be different
         assert not np.allclose(objects1['start_north'].values, objects2['start_north'].values)
+    
+    def test_global_random_state_untouched(self, sample_spatial_groups_df):
+        """Simulators draw from their own generator, not the legacy global RNG."""
+        from src.spatial_groups import SpatialGroupSimulator
+        
+        np.random.seed(0)
+        expected = np.random.random(3)
+        
+        np.random.seed(0)
+        sim = SpatialGroupSimulator(sample_spatial_groups_df, num_time_points=10, random_seed=42)
+        sim.generate_objects()
+        sim.generate_trajectories()
+        
+        np.testing.assert_array_equal(np.random.random(3), expected)
 
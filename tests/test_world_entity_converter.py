@@ -82,28 +82,114 @@ class TestWorldEntityConverter:
         obj1_keys = keys_df[(keys_df['object_id'] == 1) & (keys_df['group_id'] == 1)]['unique_key']
         assert len(obj1_keys.unique()) == 1
     
+    def test_unique_keys_continue_across_calls(self, sample_trajectories_df):
+        """New combinations continue numbering; known combinations keep their key."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter()
+        converter.create_unique_keys(sample_trajectories_df)
+        
+        second_df = pd.DataFrame({
+            'object_id': [4, 4, 1],
+            'group_id': [3, 3, 1],
+            'category': [3, 3, 1],
+            'time_percent': [0.0, 10.0, 0.0],
+            'north': [0.0, 1.0, 100.0],
+            'east': [0.0, 1.0, 50.0],
+            'down': [0.0, 1.0, 0.0]
+        })
+        keys_df = converter.create_unique_keys(second_df)
+        
+        assert keys_df['unique_key'].tolist() == [4, 4, 1]
+        assert converter.key_counter == 5
+    
+    def test_unique_keys_for_ids_outside_uint32(self):
+        """Ids that cannot be packed into 32 bits should get keys the same way."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        big_df = pd.DataFrame({
+            'object_id': [2**40, -1, 2**40, 7],
+            'group_id': [1, 1, 1, 2**33]
+        })
+        converter = WorldEntityConverter()
+        keys_df = converter.create_unique_keys(big_df)
+        
+        assert keys_df['unique_key'].tolist() == [1, 2, 1, 3]
+        assert converter.key_mapping == {(2**40, 1): 1, (-1, 1): 2, (7, 2**33): 3}
+        
+        # Packed and unpacked paths share one key mapping
+        small_df = pd.DataFrame({'object_id': [5, 5], 'group_id': [2, 2]})
+        assert converter.create_unique_keys(small_df)['unique_key'].tolist() == [4, 4]
+        mixed_df = pd.DataFrame({'object_id': [5, 7], 'group_id': [2, 2**33]})
+        assert converter.create_unique_keys(mixed_df)['unique_key'].tolist() == [4, 3]
+    
+    def test_unique_keys_leave_input_unchanged(self, sample_trajectories_df):
+        """Without inplace, the input frame should not gain a unique_key column."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        original = sample_trajectories_df.copy()
+        keys_df = WorldEntityConverter().create_unique_keys(sample_trajectories_df)
+        
+        pd.testing.assert_frame_equal(sample_trajectories_df, original)
+        assert list(keys_df.columns) == list(original.columns) + ['unique_key']
+        
+        same_df = WorldEntityConverter().create_unique_keys(sample_trajectories_df, inplace=True)
+        assert same_df is sample_trajectories_df
+        assert 'unique_key' in sample_trajectories_df.columns
+    
+    def test_key_row_indices_match_masks(self, sample_trajectories_df):
+        """Per-key row positions should select the same rows as a boolean mask."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter()
+        keys_df = converter.create_unique_keys(sample_trajectories_df.iloc[::-1])
+        indices = converter.key_row_indices(keys_df)
+        
+        assert list(indices) == [1, 2, 3]
+        for key, rows in indices.items():
+            pd.testing.assert_frame_equal(keys_df.iloc[rows], keys_df[keys_df['unique_key'] == key])
+    
     def test_create_trajectory_output_format(self, sample_trajectories_df):
-        """Should create properly formatted trajectory DataFrame."""
+        """Should create a TIME, POS_N, POS_E, POS_D array for one key."""
         from src.world_entity_converter import WorldEntityConverter
         
         converter = WorldEntityConverter()
         keys_df = converter.create_unique_keys(sample_trajectories_df)
         
         # Get data for first key
-        key_data = keys_df[keys_df['unique_key'] == 1]
-        trajectory_df = converter.format_trajectory_data(key_data)
+        key_data = keys_df.iloc[converter.key_row_indices(keys_df)[1]]
+        trajectory = converter.format_trajectory_data(key_data)
         
-        # Check columns
-        assert list(trajectory_df.columns) == ['FIELDS', 'FRAME', 'TIME', 'POS_N', 'POS_E', 'POS_D']
+        assert trajectory.shape == (len(key_data), 4)
         
-        # Check FIELDS is empty string
-        assert (trajectory_df['FIELDS'] == '').all()
+        # Check TIME matches time_percent and positions follow
+        assert trajectory[:, 0].tolist() == key_data['time_percent'].tolist()
+        assert trajectory[:, 1].tolist() == key_data['north'].tolist()
         
-        # Check FRAME is 0.0
-        assert (trajectory_df['FRAME'] == 0.0).all()
+        # A reusable buffer should yield the same values as a view into it
+        buffer = np.full((10, 4), np.nan)
+        buffered = converter.format_trajectory_data(key_data, out=buffer)
+        assert np.shares_memory(buffered, buffer)
+        np.testing.assert_array_equal(buffered, trajectory)
         
-        # Check TIME matches time_percent
-        assert trajectory_df['TIME'].tolist() == key_data['time_percent'].tolist()
+        # Column arrays give the same result as the frame
+        columns = [key_data[c].to_numpy() for c in ['time_percent', 'north', 'east', 'down']]
+        np.testing.assert_array_equal(converter.format_trajectory_arrays(*columns), trajectory)
+    
+    def test_trajectory_file_columns(self, sample_csv_file, tmp_path):
+        """Written files should have the full column layout with constant FIELDS/FRAME."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        output_base = tmp_path / 'trajectories'
+        converter = WorldEntityConverter(output_dir=output_base)
+        result = converter.convert_csv_to_world_entities(sample_csv_file)
+        
+        df = pd.read_csv(result['trajectory_files'][1], sep='\t', keep_default_na=False)
+        
+        assert list(df.columns) == ['FIELDS', 'FRAME', 'TIME', 'POS_N', 'POS_E', 'POS_D']
+        assert (df['FRAME'] == 0.0).all()
+        assert df['TIME'].tolist() == [0.0, 10.0, 20.0]
+        assert df['POS_N'].tolist() == [100.0, 105.0, 110.0]
     
     def test_save_trajectory_file(self, sample_csv_file, tmp_path, cleanup_trajectories):
         """Should save trajectory files in correct format."""
@@ -147,10 +233,7 @@ class TestWorldEntityConverter:
         from src.world_entity_converter import WorldEntityConverter
         
         converter = WorldEntityConverter()
-        keys_df = converter.create_unique_keys(sample_trajectories_df)
-        key_data = keys_df[keys_df['unique_key'] == 1]
-        
-        entity_string = converter.create_world_entity_string(1, key_data)
+        entity_string = converter.create_world_entity_string(1, 100.0, 50.0, 0.0)
         
         # Check format
         assert 'WORLD_ENTITY {' in entity_string
@@ -166,10 +249,7 @@ class TestWorldEntityConverter:
         from src.world_entity_converter import WorldEntityConverter
         
         converter = WorldEntityConverter()
-        keys_df = converter.create_unique_keys(sample_trajectories_df)
-        key_data = keys_df[keys_df['unique_key'] == 1]
-        
-        entity_string = converter.create_world_entity_string(1, key_data)
+        entity_string = converter.create_world_entity_string(1, 100.0, 50.0, 0.0)
         
         # Extract position line
         lines = entity_string.split('\n')
@@ -179,6 +259,43 @@ class TestWorldEntityConverter:
         assert '"' in position_line
         assert ', ' in position_line
     
+    def test_batch_entity_strings_match_single(self):
+        """Batch entity creation should match the single-key strings."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter()
+        keys = np.array([1, 2])
+        positions = np.array([[100.0, 50.0, 0.0], [150.5, -60.25, 5.0]])
+        
+        batch = converter.create_world_entity_strings(keys, positions)
+        
+        assert list(batch) == [1, 2]
+        assert batch[1] == converter.create_world_entity_string(1, 100.0, 50.0, 0.0)
+        assert batch[2] == converter.create_world_entity_string(2, 150.5, -60.25, 5.0)
+        assert 'position = "150.5, -60.25, 5.0"' in batch[2]
+    
+    def test_compiled_entity_builder_matches_format(self):
+        """The compiled builder should render exactly like str.format."""
+        from src.world_entity_converter import ENTITY_TEMPLATE, _compile_entity_builder
+        
+        for template in [ENTITY_TEMPLATE, 'A {{1}} "{0}" \'{1}\' {2}{3} }}']:
+            render = _compile_entity_builder(template)
+            for args in [(1, 100.0, 50.0, 0.0), (42, -0.1, 1e20, float('nan'))]:
+                assert render(*args) == template.format(*args)
+    
+    def test_first_positions_per_key(self, sample_trajectories_df):
+        """First positions should come from each key's first row, in key order."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter()
+        keys_df = converter.create_unique_keys(sample_trajectories_df.iloc[::-1])
+        keys, positions = converter.first_positions(keys_df)
+        
+        assert keys.tolist() == [1, 2, 3]
+        for key, position in zip(keys, positions):
+            first = keys_df[keys_df['unique_key'] == key].iloc[0]
+            assert position.tolist() == first[['north', 'east', 'down']].tolist()
+    
     def test_consolidated_world_entities_file(self, sample_csv_file, tmp_path, cleanup_trajectories):
         """Should create consolidated file with all WORLD_ENTITY strings."""
         from src.world_entity_converter import WorldEntityConverter
@@ -200,6 +317,10 @@ class TestWorldEntityConverter:
         assert content.count('name = G_1') == 1
         assert content.count('name = G_2') == 1
         assert content.count('name = G_3') == 1
+        
+        # Blocks are the returned entity strings, in key order, written as one join
+        strings = result['entity_strings']
+        assert content == '\n\n'.join(strings[k] for k in sorted(strings))
     
     def test_return_entity_mapping(self, sample_csv_file, tmp_path, cleanup_trajectories):
         """Should return mapping of keys to entity strings."""
@@ -215,6 +336,17 @@ class TestWorldEntityConverter:
         assert 2 in result['entity_strings']
         assert 3 in result['entity_strings']
     
+    def test_entity_positions_use_first_row_of_each_key(self, sample_csv_file, tmp_path):
+        """Each entity's position should come from its key's first trajectory row."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter(output_dir=tmp_path / 'trajectories')
+        result = converter.convert_csv_to_world_entities(sample_csv_file)
+        
+        assert 'position = "100.0, 50.0, 0.0"' in result['entity_strings'][1]
+        assert 'position = "150.0, 60.0, 5.0"' in result['entity_strings'][2]
+        assert 'position = "200.0, 70.0, -10.0"' in result['entity_strings'][3]
+    
     def test_fields_column_empty_not_nan(self, sample_csv_file, tmp_path, cleanup_trajectories):
         """FIELDS column should be empty string, not NaN."""
         from src.world_entity_converter import WorldEntityConverter
@@ -233,4 +365,194 @@ class TestWorldEntityConverter:
         assert not df['FIELDS'].isna().any()
         # FIELDS should be empty strings
         assert (df['FIELDS'] == '').all()
-
+    
+    def test_trajectory_file_written_without_dataframe(self, tmp_path, monkeypatch):
+        """Constant FIELDS/FRAME columns come from the row format, not a per-key frame."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        converter = WorldEntityConverter(output_dir=tmp_path)
+        trajectory = converter.format_trajectory_arrays(np.array([0.0, 1.0]), np.array([1.0, 2.0]),
+                                                        np.array([3.0, 4.0]), np.array([5.0, 6.0]))
+        
+        def no_frames(*args, **kwargs):
+            raise AssertionError('DataFrame built while writing')
+        
+        monkeypatch.setattr(pd, 'DataFrame', no_frames)
+        path = converter.save_trajectory_file(1, trajectory)
+        
+        assert path.read_text().splitlines()[1:] == [
+            '\t0.0\t0.000000\t1.000000\t3.000000\t5.000000',
+            '\t0.0\t1.000000\t2.000000\t4.000000\t6.000000'
+        ]
+    
+    def test_process_multiple_csvs_consolidates_once(self, sample_trajectories_df, tmp_path):
+        """Multiple files should share key numbering and one consolidated file."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        first_csv = tmp_path / "first.csv"
+        second_csv = tmp_path / "second.csv"
+        sample_trajectories_df.to_csv(first_csv, index=False)
+        second_df = sample_trajectories_df.copy()
+        second_df['object_id'] += 10
+        second_df.to_csv(second_csv, index=False)
+        
+        output_base = tmp_path / 'trajectories'
+        converter = WorldEntityConverter(output_dir=output_base)
+        result = converter.process_multiple_csvs([first_csv, second_csv])
+        
+        assert result['num_entities'] == 6
+        assert result['consolidated_file'] == output_base / 'all_G_WORLD_ENTITIES.txt'
+        
+        content = result['consolidated_file'].read_text()
+        names = [line.strip() for line in content.splitlines() if line.strip().startswith('name = ')]
+        assert names == [f'name = G_{k}' for k in range(1, 7)]
+    
+    def test_csv_read_with_schema_dtypes(self, sample_csv_file, tmp_path, monkeypatch):
+        """Trajectory CSVs should be parsed with the declared schema dtypes."""
+        from src import world_entity_converter
+        
+        read_frames = []
+        original_create = world_entity_converter.WorldEntityConverter.create_unique_keys
+        
+        def capture(self, df, inplace=False):
+            read_frames.append(df)
+            return original_create(self, df, inplace=inplace)
+        
+        monkeypatch.setattr(world_entity_converter.WorldEntityConverter, 'create_unique_keys', capture)
+        converter = world_entity_converter.WorldEntityConverter(output_dir=tmp_path / 'trajectories')
+        converter.convert_csv_to_world_entities(sample_csv_file)
+        
+        dtypes = read_frames[0].dtypes
+        for column, dtype in world_entity_converter.TRAJECTORY_SCHEMA.items():
+            assert dtypes[column] == dtype
+        
+        # Columns the conversion does not use are never parsed
+        assert 'category' not in read_frames[0].columns
+    
+    def test_csv_engine_selectable(self, sample_csv_file, tmp_path):
+        """Every CSV parser should produce the same conversion."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        results = [
+            WorldEntityConverter(output_dir=tmp_path / engine, engine=engine).convert_csv_to_world_entities(sample_csv_file)
+            for engine in ['c', 'python']
+        ]
+        
+        assert results[0]['entity_strings'] == results[1]['entity_strings']
+        for key, path in results[0]['trajectory_files'].items():
+            assert results[1]['trajectory_files'][key].read_text() == path.read_text()
+    
+    def test_interleaved_rows_keep_order_within_key(self, tmp_path):
+        """Rows for a key should be grouped together in their original order."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        csv_file = tmp_path / "interleaved.csv"
+        pd.DataFrame({
+            'object_id': [1, 2, 1, 2, 1],
+            'group_id': [1, 1, 1, 1, 1],
+            'category': [1, 1, 1, 1, 1],
+            'time_percent': [0.0, 5.0, 10.0, 15.0, 20.0],
+            'north': [1.0, 2.0, 3.0, 4.0, 5.0],
+            'east': [0.0, 0.0, 0.0, 0.0, 0.0],
+            'down': [0.0, 0.0, 0.0, 0.0, 0.0]
+        }).to_csv(csv_file, index=False)
+        
+        converter = WorldEntityConverter(output_dir=tmp_path / 'trajectories')
+        result = converter.convert_csv_to_world_entities(csv_file)
+        
+        first = pd.read_csv(result['trajectory_files'][1], sep='\t', keep_default_na=False)
+        second = pd.read_csv(result['trajectory_files'][2], sep='\t', keep_default_na=False)
+        assert first['TIME'].tolist() == [0.0, 10.0, 20.0]
+        assert second['TIME'].tolist() == [5.0, 15.0]
+        assert 'position = "2.0, 0.0, 0.0"' in result['entity_strings'][2]
+    
+    def test_threaded_writes_match_serial(self, sample_csv_file, tmp_path):
+        """Writing trajectory files with worker threads should give identical output."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        serial = WorldEntityConverter(output_dir=tmp_path / 'serial').convert_csv_to_world_entities(sample_csv_file)
+        threaded = WorldEntityConverter(output_dir=tmp_path / 'threaded', workers=4).convert_csv_to_world_entities(sample_csv_file)
+        
+        assert threaded['entity_strings'] == serial['entity_strings']
+        assert list(threaded['trajectory_files']) == list(serial['trajectory_files'])
+        for key, path in serial['trajectory_files'].items():
+            assert threaded['trajectory_files'][key].read_text() == path.read_text()
+    
+    def test_auto_workers(self, tmp_path):
+        """workers=None should size the write pool from the CPU count."""
+        from src.world_entity_converter import AUTO_WORKERS, WorldEntityConverter
+        
+        assert WorldEntityConverter(output_dir=tmp_path, workers=None).workers == AUTO_WORKERS
+        assert 4 <= AUTO_WORKERS <= 32
+    
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_chunked_read_matches_whole_file(self, tmp_path, workers):
+        """Reading the CSV in small blocks should give identical output."""
+        from src.world_entity_converter import WorldEntityConverter
+        
+        rng = np.random.default_rng(0)
+        csv_file = tmp_path / "many_keys.csv"
+        pd.DataFrame({
+            'object_id': rng.integers(1, 8, 200),
+            'group_id': rng.integers(1, 3, 200),
+            'category': 1,
+            'time_percent': np.linspace(0, 100, 200),
+            'north': rng.normal(0, 100, 200),
+            'east': rng.normal(0, 100, 200),
+            'down': rng.normal(0, 10, 200)
+        }).to_csv(csv_file, index=False)
+        
+        whole = WorldEntityConverter(output_dir=tmp_path / 'whole').convert_csv_to_world_entities(csv_file)
+        chunked = WorldEntityConverter(output_dir=tmp_path / 'chunked', workers=workers,
+                                       chunk_rows=17).convert_csv_to_world_entities(csv_file)
+        
+        assert chunked['entity_strings'] == whole['entity_strings']
+        assert list(chunked['entity_strings']) == list(whole['entity_strings'])
+        assert list(chunked['trajectory_files']) == list(whole['trajectory_files'])
+        for key, path in whole['trajectory_files'].items():
+            assert chunked['trajectory_files'][key].read_text() == path.read_text()
+    
+    def test_trajectory_rows_match_savetxt(self, tmp_path):
+        """Trajectory rows should be exactly what np.savetxt writes with the row format."""
+        import io
+        from src.world_entity_converter import (WorldEntityConverter, TRAJECTORY_HEADER,
+                                                TRAJECTORY_ROW_FORMAT)
+        
+        trajectory = np.array([[0.0, -0.0, 1e-9, -2.5e-7],
+                               [50.0, np.nan, np.inf, -np.inf],
+                               [100.0, 1e15, -123.4567895, 3.0000005]])
+        
+        expected = io.StringIO()
+        np.savetxt(expected, trajectory, fmt=TRAJECTORY_ROW_FORMAT)
+        
+        path = WorldEntityConverter(output_dir=tmp_path).save_trajectory_file(1, trajectory)
+        assert path.read_text() == TRAJECTORY_HEADER + expected.getvalue()
+    
+    def test_fast_write_matches_savetxt(self, tmp_path):
+        """The Numba row writer should produce byte-identical trajectory files."""
+        pytest.importorskip('numba')
+        from src.world_entity_converter import FAST_WRITE_MAX_ABS, WorldEntityConverter
+        
+        rng = np.random.default_rng(0)
+        # Non-integer values of both signs across every magnitude the fast
+        # writer accepts, up to just below its bound
+        magnitudes = np.exp(rng.uniform(np.log(1e-7), np.log(FAST_WRITE_MAX_ABS), (5000, 3)))
+        near_bound = np.nextafter(FAST_WRITE_MAX_ABS, 0) - rng.uniform(0, 1e3, (1000, 3))
+        positions = np.vstack([magnitudes, near_bound]) * rng.choice([-1, 1], (6000, 3))
+        trajectory = np.column_stack([np.linspace(0, 100, 6000), positions])
+        # Signed zero, sub-precision negatives and half-way points
+        trajectory[:4, 1:] = [[-0.0, 0.0, -1e-9], [0.0000005, 2.5e-6, 3.0000005],
+                              [999999.9999995, -12.5, 9e9 + 0.5], [-0.0000015, 7.0, -7.0]]
+        assert np.all(np.abs(trajectory) < FAST_WRITE_MAX_ABS)
+        
+        plain = WorldEntityConverter(output_dir=tmp_path / 'plain')
+        fast = WorldEntityConverter(output_dir=tmp_path / 'fast', fast_write=True)
+        assert fast.fast_write
+        
+        expected = plain.save_trajectory_file(1, trajectory).read_bytes()
+        assert fast.save_trajectory_file(1, trajectory).read_bytes() == expected
+        
+        # Larger values fall back to %-formatting
+        trajectory[0, 1] = 9.9e11 + 0.123
+        expected = plain.save_trajectory_file(2, trajectory).read_bytes()
+        assert fast.save_trajectory_file(2, trajectory).read_bytes() == expected